@@ -0,0 +1,50 @@
+"""Compares two result files of benchmarks/suite.py.
+
+Prints every timing and memory figure of both runs with the ratio new / old, so values above
+1 are regressions.
+
+Usage: python benchmarks/compare.py <old.json> <new.json>
+"""
+import sys
+import json
+
+# The figure that's compared for each kind of result
+METRICS = ("per_call_us", "median", "peak_bytes", "retained_bytes")
+
+
+def flatten(results, prefix=""):
+    for name, value in results.items():
+        if name == "meta" or not isinstance(value, dict):
+            continue
+        found = False
+        for metric in METRICS:
+            if metric in value:
+                found = True
+                yield f"{prefix}{name}.{metric}", value[metric]
+                if metric in ("per_call_us", "median"):
+                    break
+        if not found:
+            yield from flatten(value, f"{prefix}{name}.")
+
+
+def main():
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+
+    with open(sys.argv[1]) as handle:
+        old = dict(flatten(json.load(handle)))
+    with open(sys.argv[2]) as handle:
+        new = dict(flatten(json.load(handle)))
+
+    width = max(len(name) for name in {**old, **new})
+    for name in {**old, **new}:
+        before = old.get(name)
+        after = new.get(name)
+        ratio = f"{after / before:.2f}x" if before and after is not None else "-"
+        print(f"{name:<{width}}  {before if before is not None else '-':>14}  "
+              f"{after if after is not None else '-':>14}  {ratio:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Times the costume pass of _make_mon_list.
+
+Compares the old pass, which ran several regexes per icon and looked every mon up with a scan
+over all mons, with the single join done by _make_costume_list. The icon listing mirrors the
+PokeMiners image tree: every mon has a regular and a shiny icon, some have costume icons, and
+there are unrelated files in other folders.
+
+Usage: python benchmarks/costumes.py [mons] [costumes per mon]
+"""
+import re
+import sys
+import json
+import time
+from enum import Enum
+
+sys.path.insert(0, ".")
+
+from pogodata.pokemon import Pokemon, PokemonType, _make_costume_list  # noqa: E402
+
+
+def make_mons(count):
+    mons = []
+    for i in range(1, count + 1):
+        mon = Pokemon(None, {"pokemonId": f"MON_{i}"}, 0, f"MON_{i}")
+        mon.id = i
+        mon.gen_asset()
+        mons.append(mon)
+    return mons
+
+
+def make_icons(count, costumes):
+    icons = []
+    for i in range(1, count + 1):
+        icons.append(f"Images/Pokemon/pokemon_icon_{i:03}_00.png")
+        icons.append(f"Images/Pokemon/pokemon_icon_{i:03}_00_shiny.png")
+        for costume in range(1, costumes + 1):
+            icons.append(f"Images/Pokemon/pokemon_icon_{i:03}_00_{costume:02}.png")
+            icons.append(f"Images/Pokemon/pokemon_icon_{i:03}_00_{costume:02}_shiny.png")
+        icons.append(f"Images/Items/item_{i}.png")
+    return icons
+
+
+def old_costume_pass(mons, icons, costumes):
+    def get_mon(asset):
+        for mon in mons:
+            if mon.asset == asset:
+                return mon
+        return Pokemon(None, {}, 0, "UNSET")
+
+    for icon in icons:
+        match = re.match(r"Images/Pokemon/pokemon_icon(_\d*){3}(?!\d*_?shiny).png", icon)
+        if match:
+            icon = icon.replace(".png", "")
+            icon = icon.replace("Images/Pokemon/", "")
+
+            costume = re.findall(r"_\d*$", icon)[0]
+            og_asset = re.sub(costume + "$", "", icon)
+            og_asset = re.sub(r"_01$", "_00", og_asset)
+            costume = int(costume.strip("_"))
+
+            mon = get_mon(og_asset)
+            copy = mon.copy()
+            copy.costume = costumes(costume)
+            copy.gen_asset()
+            copy.type = PokemonType.COSTUME
+            mons.append(copy)
+
+
+def new_costume_pass(mons, icons, costumes):
+    mons.extend(_make_costume_list(mons, icons, costumes))
+
+
+def measure(function, count, costumes):
+    mons = make_mons(count)
+    icons = make_icons(count, costumes)
+    costume_enum = Enum("Costume", {f"COSTUME_{i}": i for i in range(costumes + 1)})
+
+    start = time.perf_counter()
+    function(mons, icons, costume_enum)
+    seconds = time.perf_counter() - start
+    return {"icons": len(icons), "mons": len(mons), "seconds": round(seconds, 4)}
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    costumes = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+
+    results = {
+        "old": measure(old_costume_pass, count, costumes),
+        "new": measure(new_costume_pass, count, costumes)
+    }
+    results["speedup"] = round(results["old"]["seconds"] / max(results["new"]["seconds"], 1e-9), 1)
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Measures the memory held by Pokemon objects after a reload.
+
+Builds mons from gamemaster-like entries, adds costume variants the way _make_mon_list does,
+drops the gamemaster itself and reports what the objects keep alive, once per raw mode.
+Only uses the public object API, so it can be run against older versions for comparison.
+
+Usage: python benchmarks/memory.py [mons] [costumes per mon]
+"""
+import gc
+import sys
+import json
+import tracemalloc
+
+sys.path.insert(0, ".")
+
+from pogodata.pokemon import Pokemon  # noqa: E402
+
+try:
+    from pogodata.objects import RawMode
+except ImportError:
+    RawMode = None
+
+
+def make_entry(i):
+    return {
+        "templateId": f"V{i:04}_POKEMON_MON_{i}",
+        "data": {
+            "templateId": f"V{i:04}_POKEMON_MON_{i}",
+            "pokemonSettings": {
+                "pokemonId": f"MON_{i}",
+                "modelScale": 1.09,
+                "type": "POKEMON_TYPE_GRASS",
+                "type2": "POKEMON_TYPE_POISON",
+                "camera": {"diskRadiusM": 0.5723, "cylinderRadiusM": 0.3815, "cylinderHeightM": 0.763,
+                           "shoulderModeScale": 0.5},
+                "encounter": {"baseCaptureRate": 0.2, "baseFleeRate": 0.1, "collisionRadiusM": 0.3815,
+                              "collisionHeightM": 0.654, "collisionHeadRadiusM": 0.2725, "movementType": "MOVEMENT_JUMP",
+                              "movementTimerS": 10, "jumpTimeS": 1.15, "attackTimerS": 29, "attackProbability": 0.1,
+                              "dodgeProbability": 0.15, "dodgeDurationS": 1, "dodgeDistance": 1,
+                              "cameraDistance": 3.75, "minPokemonActionFrequencyS": 0.2,
+                              "maxPokemonActionFrequencyS": 1.6},
+                "stats": {"baseStamina": 128 + i % 50, "baseAttack": 118 + i % 70, "baseDefense": 111 + i % 60},
+                "quickMoves": ["VINE_WHIP_FAST", "TACKLE_FAST"],
+                "cinematicMoves": ["SLUDGE_BOMB", "SEED_BOMB", "POWER_WHIP"],
+                "animationTime": [1.6667, 0.6667, 1.6667, 1.8333, 0, 2.1667, 1.4, 1.466667],
+                "evolutionIds": [f"MON_{i + 1}"],
+                "evolutionPips": 1,
+                "pokedexHeightM": 0.7,
+                "pokedexWeightKg": 6.9,
+                "heightStdDev": 0.0875,
+                "weightStdDev": 0.8625,
+                "familyId": f"FAMILY_MON_{i}",
+                "candyToEvolve": 25,
+                "kmBuddyDistance": 3,
+                "evolutionBranch": [{"evolution": f"MON_{i + 1}", "candyCost": 25, "form": f"MON_{i + 1}_NORMAL"}],
+                "thirdMove": {"stardustToUnlock": 10000, "candyToUnlock": 25},
+                "isTransferable": True,
+                "isDeployable": True,
+                "isTradable": True,
+                "shadow": {"purificationStardustNeeded": 3000, "purificationCandyNeeded": 3,
+                           "purifiedChargeMove": "RETURN", "shadowChargeMove": "FRUSTRATION"},
+                "buddyGroupNumber": 2,
+                "buddyWalkedMegaEnergyAward": 15
+            }
+        }
+    }
+
+
+def build(count, costumes, raw_mode):
+    gamemaster = json.loads(json.dumps([make_entry(i) for i in range(count)]))
+    mons = []
+    for i, entry in enumerate(gamemaster):
+        settings = entry["data"]["pokemonSettings"]
+        mon = Pokemon(None, settings, 0, settings["pokemonId"])
+        mon.id = i
+        mon.gen_asset()
+        mons.append(mon)
+        for _ in range(costumes):
+            variant = mon.copy()
+            variant.gen_asset()
+            mons.append(variant)
+
+    if raw_mode is not None:
+        for mon in mons:
+            mon.compact_raw(raw_mode)
+    del gamemaster
+    return mons
+
+
+def measure(count, costumes, raw_mode):
+    gc.collect()
+    tracemalloc.start()
+    mons = build(count, costumes, raw_mode)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"objects": len(mons), "bytes": size, "bytes_per_object": round(size / len(mons))}
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    costumes = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+
+    modes = [None] if RawMode is None else list(RawMode)
+    results = {}
+    for mode in modes:
+        name = "keep" if mode is None else mode.name.lower()
+        results[name] = measure(count, costumes, mode)
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Records all upstream sources of a reload, to run the benchmarks against.
+
+Every downloaded file is written to the fixture directory in the layout LocalTransport reads,
+so the recorded data can be served without any network access afterwards.
+
+Usage: python benchmarks/record.py <fixture dir> [icon set ...]
+"""
+import os
+import sys
+
+sys.path.insert(0, ".")
+
+from pogodata import PogoData, HttpTransport, LocalTransport  # noqa: E402
+
+
+class RecordingTransport:
+    def __init__(self, path, transport=None):
+        self.path = path
+        self.transport = transport or HttpTransport()
+
+    def get(self, url, headers=None):
+        response = self.transport.get(url)
+        filename = os.path.join(self.path, LocalTransport.filename(url))
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(filename, "wb") as handle:
+            handle.write(response.content)
+        return response
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    path = sys.argv[1]
+    transport = RecordingTransport(path)
+    # The default icon set needs no listing, PMSF sets record their repo's file tree
+    for iconset in sys.argv[2:] or [None]:
+        PogoData(icons=iconset, transport=transport)
+    print(f"Recorded fixtures to {path}")
+
+
+if __name__ == "__main__":
+    main()
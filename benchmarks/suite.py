@@ -0,0 +1,174 @@
+"""Benchmarks reloads, loading saved data, lookups, icons, enums and CP calculations.
+
+Runs against fixtures recorded with benchmarks/record.py, served by a LocalTransport, so no
+network is needed and every run sees the same data. Results are written as JSON, to be compared
+between versions with benchmarks/compare.py.
+
+Usage: python benchmarks/suite.py <fixture dir> [--icons SET] [--repeat N] [--output FILE]
+"""
+import gc
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+import subprocess
+from datetime import datetime
+
+sys.path.insert(0, ".")
+
+from pogodata import PogoData, LocalTransport, load_pogodata  # noqa: E402
+
+SAMPLE_SIZE = 200
+
+
+def timed(function, repeat):
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return {"runs": repeat, "min": min(times), "median": statistics.median(times)}
+
+
+def per_call(function, calls, repeat):
+    """Times a function doing `calls` operations and adds the time per operation in microseconds"""
+    result = timed(function, repeat)
+    result["calls"] = calls
+    result["per_call_us"] = result["median"] / max(calls, 1) * 1e6
+    return result
+
+
+def sample(objs):
+    objs = list(objs)
+    step = max(len(objs) // SAMPLE_SIZE, 1)
+    return objs[::step][:SAMPLE_SIZE]
+
+
+def lookup(function, queries, repeat):
+    def run():
+        for query in queries:
+            function(**query)
+    return per_call(run, len(queries), repeat)
+
+
+def bench_reload(args):
+    return timed(lambda: PogoData(icons=args.icons, transport=LocalTransport(args.fixtures)), args.repeat)
+
+
+def bench_load(args, data):
+    with tempfile.TemporaryDirectory() as path:
+        path += "/"
+        data.save(path)
+        return timed(lambda: load_pogodata(path, transport=LocalTransport(args.fixtures)), args.repeat)
+
+
+def bench_lookups(args, data):
+    mons = sample(data.mons)
+    items = sample(data.items)
+    repeat = args.repeat
+    keys = [(m.id, m.form, m.costume, m.temp_evolution) for m in mons]
+    return {
+        "get_mon_id": lookup(data.get_mon, [{"id": m.id} for m in mons], repeat),
+        "get_mon_template": lookup(data.get_mon, [{"template": m.template} for m in mons], repeat),
+        "get_mon_id_form": lookup(data.get_mon, [{"id": m.id, "form": m.form} for m in mons], repeat),
+        "get_mon_asset": lookup(data.get_mon, [{"asset": m.asset} for m in mons], repeat),
+        "get_mon_all_id": lookup(data.get_mon, [{"id": m.id, "get_all": True} for m in mons], repeat),
+        "get_mon_missing": lookup(data.get_mon, [{"id": -1}] * len(mons), repeat),
+        "get_mons_batch": per_call(lambda: data.get_mons(keys), len(keys), repeat),
+        "get_item_id": lookup(data.get_item, [{"id": i.id} for i in items], repeat),
+        "get_item_template": lookup(data.get_item, [{"template": i.template} for i in items], repeat),
+        "get_item_name": lookup(data.get_item, [{"name": i.name} for i in items], repeat)
+    }
+
+
+def bench_icons(args, data):
+    mons = list(data.mons)
+
+    def run():
+        for mon in mons:
+            data.icon.pokemon(mon)
+    return per_call(run, len(mons), args.repeat)
+
+
+def bench_enums(args, data):
+    queries = [
+        {"enum": "Form"},
+        {"enum": "HoloPokemonId"},
+        {"enum": "Costume", "as_enum": True},
+        {"enum": "HoloPokemonId", "reverse": True}
+    ]
+    return lookup(data.get_enum, queries, args.repeat)
+
+
+def bench_cp(args, data):
+    mons = [m for m in data.mons if m.stats]
+    levels = [1, 15, 20, 25, 30, 35, 40]
+
+    def run():
+        for mon in mons:
+            for level in levels:
+                mon.cp(level, (15, 15, 15))
+    return per_call(run, len(mons) * len(levels), args.repeat)
+
+
+def bench_memory(args):
+    gc.collect()
+    tracemalloc.start()
+    data = PogoData(icons=args.icons, transport=LocalTransport(args.fixtures))
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+    return {"peak_bytes": peak, "retained_bytes": current}
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "describe", "--always", "--dirty"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks pogodata against recorded fixtures")
+    parser.add_argument("fixtures", help="A directory recorded with benchmarks/record.py")
+    parser.add_argument("--icons", default=None, help="The icon set to use, e.g. HOME")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None, help="Write results to this file instead of stdout")
+    args = parser.parse_args()
+
+    data = PogoData(icons=args.icons, transport=LocalTransport(args.fixtures))
+    results = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": datetime.utcnow().isoformat(),
+            "icons": args.icons,
+            "repeat": args.repeat,
+            "mons": len(data.mons)
+        },
+        "reload": bench_reload(args),
+        "load_pogodata": bench_load(args, data),
+        "lookups": bench_lookups(args, data),
+        "icon_pokemon": bench_icons(args, data),
+        "get_enum": bench_enums(args, data),
+        "cp": bench_cp(args, data),
+        "memory": bench_memory(args)
+    }
+
+    output = json.dumps(results, indent=4)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
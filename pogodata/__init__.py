@@ -3,7 +3,14 @@ from .icons import IconSet, IconSet
 from .pokemon import Pokemon
 from .weather import Weather
 from .objects import Type
-from .event import Event
+from .event import Event, EventBonusType, EventIndex, ActiveMons
 from .grunt import Grunt
 from .move import Move
 from .item import Item
+from .misc import HttpTransport, FetchError
+from .fetch import LocalTransport, CachedTransport
+from .snapshot import SnapshotError
+from .evolution import EvolutionGraph
+from .instrument import Metrics
+from .index import Range
+from .changes import Changes
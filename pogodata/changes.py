@@ -0,0 +1,148 @@
+import json
+from enum import Enum
+from collections import namedtuple
+
+Changes = namedtuple("Changes", ("added", "removed", "changed"))
+Changes.__doc__ = """What changed in one subsystem between two reloads.
+
+`added` holds new objects, `removed` old ones and `changed` (old, new) pairs of objects that
+kept their key but whose content differs.
+"""
+
+
+def _value(value):
+    return value.value if isinstance(value, Enum) else value
+
+
+def _template(obj):
+    return None if obj is None else obj.template
+
+
+def _templates(objs):
+    return tuple(_template(obj) for obj in objs)
+
+
+def _mon_key(mon):
+    return mon.template, mon.form, _value(mon.costume), _value(mon.temp_evolution)
+
+
+def _mon_keys(mons):
+    return tuple(_mon_key(mon) for mon in mons)
+
+
+def _reward(reward):
+    key = _mon_key(reward) if hasattr(reward, "form") else str(reward)
+    return _value(reward.reward_type), key, getattr(reward, "amount", None)
+
+
+# Contents are made of the attributes the builders derive, not the raw gamemaster entries, so
+# changes are found with every raw_mode
+def _type(type_):
+    return type_.id, type_.name
+
+
+def _item(item):
+    return (
+        item.id, item.name, item.min_level, _value(item.type), _value(item.category),
+        tuple((_value(effect), value) for effect, value in item.food_effects)
+    )
+
+
+def _weather(weather):
+    return weather.id, weather.name, _templates(weather.type_boosts)
+
+
+def _move(move):
+    return (
+        move.id, move.name, _template(move.type), move.power, move.energy_delta,
+        json.dumps(move.buffs, sort_keys=True)
+    )
+
+
+def _mon(mon):
+    return (
+        mon.id, mon.name, mon.asset, _value(mon.type), mon.stats, mon.family, _templates(mon.types),
+        _templates(mon.quick_moves), _templates(mon.charge_moves),
+        _templates(mon.elite_quick_moves), _templates(mon.elite_charge_moves),
+        _mon_keys(mon.evolutions), _mon_keys(mon.temp_evolutions),
+        mon.deployable, mon.transferable, mon.tradable
+    )
+
+
+def _grunt(grunt):
+    return (
+        grunt.id, grunt.name, grunt.active, _value(grunt.gender), grunt.boss, _template(grunt.type),
+        tuple(_mon_keys(slot) for slot in grunt.team), _mon_keys(grunt.rewards)
+    )
+
+
+def _event(event):
+    return (
+        _value(event.type), event.end, _mon_keys(event.spawns), _mon_keys(event.eggs),
+        _mon_keys(event.raids), _mon_keys(event.shinies), tuple(event.features),
+        tuple((_value(bonus.type), bonus.value) for bonus in event.bonuses)
+    )
+
+
+# How objects of every subsystem are identified across reloads, and what's compared for changes
+KEYS = {
+    "types": (_template, _type),
+    "items": (_template, _item),
+    "weather": (_template, _weather),
+    "moves": (_template, _move),
+    "mons": (_mon_key, _mon),
+    "quests": (
+        lambda quest: (_value(quest.type), quest.task, tuple(_reward(reward) for reward in quest.rewards)),
+        None
+    ),
+    "raids": (lambda mon: (mon.level,) + _mon_key(mon), None),
+    "grunts": (_template, _grunt),
+    "events": (lambda event: (event.name, event.start), _event)
+}
+
+
+def _keyed(objs, key):
+    keyed = {}
+    for obj in objs:
+        obj_key = key(obj)
+        # Objects sharing a key are told apart by their order
+        occurrence = 0
+        while (obj_key, occurrence) in keyed:
+            occurrence += 1
+        keyed[(obj_key, occurrence)] = obj
+    return keyed
+
+
+def diff(name, old_objs, new_objs):
+    """Returns the :class:`Changes` between two lists of a subsystem"""
+    key, content = KEYS[name]
+    old = _keyed(old_objs, key)
+    new = _keyed(new_objs, key)
+
+    added = [obj for obj_key, obj in new.items() if obj_key not in old]
+    removed = [obj for obj_key, obj in old.items() if obj_key not in new]
+    changed = []
+    if content is not None:
+        for obj_key, obj in new.items():
+            old_obj = old.get(obj_key)
+            if old_obj is not None and content(old_obj) != content(obj):
+                changed.append((old_obj, obj))
+    return Changes(added, removed, changed)
+
+
+def diff_snapshots(old, new, subsystems):
+    """Returns a dict of :class:`Changes` for every subsystem that changed between two snapshots.
+
+    Subsystems taken over unchanged are skipped without comparing anything, as are ones that
+    weren't built in both snapshots.
+    """
+    changes = {}
+    for name in subsystems:
+        old_objs = old.__dict__.get(name)
+        new_objs = new.__dict__.get(name)
+        if old_objs is None or new_objs is None or old_objs is new_objs:
+            continue
+        subsystem_changes = diff(name, old_objs, new_objs)
+        if any(subsystem_changes):
+            changes[name] = subsystem_changes
+    return changes
@@ -0,0 +1,141 @@
+"""Vectorized CP and HP calculations. Requires numpy (`pip install pogodata[cp]`)"""
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .misc import CP_MULTIPLIERS
+from .pokemon import Pokemon
+
+MIN_LEVEL = 1
+MAX_LEVEL = max(CP_MULTIPLIERS)
+
+if np is not None:
+    # Multipliers by half level, so level L is at index int(L * 2) - 2
+    LEVELS = np.arange(MIN_LEVEL * 2, MAX_LEVEL * 2 + 1) / 2
+    MULTIPLIERS = np.array([CP_MULTIPLIERS[level] for level in LEVELS.tolist()])
+
+    # All 4096 IV combinations. (attack, defense, stamina) is at index attack*256 + defense*16 + stamina
+    IVS = np.stack(np.meshgrid(np.arange(16), np.arange(16), np.arange(16), indexing="ij"), -1).reshape(-1, 3)
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("pogodata.cp requires numpy. Install it with: pip install pogodata[cp]")
+
+
+def base_stats(mons):
+    """Returns an array of (attack, defense, stamina) base stats.
+
+    `mons` can be a :class:`.Pokemon`, a list of them, or anything numpy can turn into an
+    array of shape (3,) or (..., 3).
+    """
+    _require_numpy()
+    if isinstance(mons, Pokemon):
+        mons = mons.stats
+    elif isinstance(mons, (list, tuple)) and mons and isinstance(mons[0], Pokemon):
+        mons = [mon.stats for mon in mons]
+
+    stats = np.asarray(mons, dtype=np.float64)
+    if stats.ndim == 0 or stats.shape[-1] != 3:
+        raise ValueError("Base stats must be (attack, defense, stamina). Pokémon without stats can't be used")
+    return stats
+
+
+def level_index(levels):
+    """Returns the positions of the given levels in :data:`LEVELS` and :data:`MULTIPLIERS`.
+    Raises ValueError for levels that aren't whole or half levels between 1 and 55"""
+    _require_numpy()
+    doubled = np.asarray(levels, dtype=np.float64) * 2
+    index = np.rint(doubled).astype(np.intp)
+    unknown = (index != doubled) | (index < MIN_LEVEL * 2) | (index > MAX_LEVEL * 2)
+    if np.any(unknown):
+        raise ValueError(f"Unknown level {doubled[unknown].flat[0] / 2:g}")
+    return index - MIN_LEVEL * 2
+
+
+def _grid(mons, levels, ivs):
+    stats = base_stats(mons)
+    if levels is None:
+        levels = LEVELS
+    multipliers = MULTIPLIERS[level_index(levels)]
+    ivs = IVS if ivs is None else np.asarray(ivs, dtype=np.float64)
+
+    shape = stats.shape[:-1] + multipliers.shape + ivs.shape[:-1]
+    total = stats.reshape(-1, 1, 1, 3) + ivs.reshape(1, 1, -1, 3)
+    return total, multipliers.reshape(1, -1, 1), shape
+
+
+def _cp(total, multipliers):
+    # Same order of operations and minimum of 10 as Pokemon.cp, so both return the same values
+    cp = np.floor(total[..., 0] * total[..., 1]**0.5 * total[..., 2]**0.5 * multipliers**2 / 10)
+    return np.maximum(cp, 10).astype(np.int32)
+
+
+def _hp(total, multipliers):
+    return np.maximum(np.floor(total[..., 2] * multipliers), 10).astype(np.int32)
+
+
+def _result(values, shape):
+    # Scalar inputs give a plain int, like Pokemon.cp
+    values = values.reshape(shape)
+    return int(values) if values.ndim == 0 else values
+
+
+def calculate_cp(mons, levels=None, ivs=None):
+    """Calculates the CP of every combination of mons, levels and IVs at once.
+
+    Parameters
+    ----------
+    mons:
+        Base stats, see :func:`base_stats`.
+    levels:
+        A level or an array of levels. Default: all levels (:data:`LEVELS`)
+    ivs:
+        An (attack, defense, stamina) tuple or an array of them. Default: all 4096 (:data:`IVS`)
+
+    Returns
+    -------
+    An int array of shape `mons.shape[:-1] + levels.shape + ivs.shape[:-1]`, or an
+    :class:`int` if a single Pokémon, level and IV combination is given. Like in the game, CP is
+    at least 10.
+    """
+    total, multipliers, shape = _grid(mons, levels, ivs)
+    return _result(_cp(total, multipliers), shape)
+
+
+def calculate_hp(mons, levels=None, ivs=None):
+    """Calculates the HP of every combination of mons, levels and IVs at once.
+    Takes the same arguments and returns the same shape as :func:`calculate_cp`"""
+    total, multipliers, shape = _grid(mons, levels, ivs)
+    return _result(_hp(total, multipliers), shape)
+
+
+def solve(mon, cp, hp=None, levels=None):
+    """Finds every level and IV combination a Pokémon could have, given its CP and optionally HP.
+
+    Parameters
+    ----------
+    mon:
+        Base stats of a single Pokémon, see :func:`base_stats`.
+    cp: :class:`int`
+    hp: :class:`int`
+    levels:
+        The levels to consider. Default: all levels (:data:`LEVELS`)
+
+    Returns
+    -------
+    A tuple of a float array of levels and an (n, 3) int array of the matching IVs.
+    """
+    stats = base_stats(mon)
+    if stats.ndim != 1:
+        raise ValueError("solve() takes the base stats of a single Pokémon")
+
+    total, multipliers, _ = _grid(stats, levels, None)
+    matches = _cp(total, multipliers)[0] == cp
+    if hp is not None:
+        matches &= _hp(total, multipliers)[0] == hp
+
+    level_positions, iv_positions = np.nonzero(matches)
+    levels = LEVELS if levels is None else np.atleast_1d(np.asarray(levels, dtype=np.float64))
+    return levels[level_positions], IVS[iv_positions]
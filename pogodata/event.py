@@ -1,6 +1,11 @@
 from enum import Enum
+from bisect import bisect_left, bisect_right
 from datetime import datetime
-from .misc import match_enum, httpget, INFO_URL
+from collections import namedtuple
+from .misc import match_enum
+
+ActiveMons = namedtuple("ActiveMons", ("spawns", "eggs", "raids", "shinies"))
+ActiveMons.__doc__ = "Frozensets of the Pokémon of all events active at one time"
 
 
 class EventType(Enum):
@@ -56,23 +61,92 @@ class Event:
         return datetime.strptime(time, "%Y-%m-%d %H:%M")
 
 
-def __mon_list(raw_list, get_mon):
-    final = []
-    for raw_mon in raw_list:
-        mon = get_mon(**raw_mon)
-        final.append(mon)
-    return final
-
+def _bonus_types(bonus):
+    if bonus is None:
+        return None
+    if isinstance(bonus, (list, tuple, set, frozenset)):
+        return {match_enum(EventBonusType, b) for b in bonus}
+    return {match_enum(EventBonusType, bonus)}
+
+
+class EventIndex:
+    """Finds the events active at a time or during a time range.
+
+    The start and end times of all events split time into windows, in which the same events are
+    active. A query is a binary search for its window. Events without a start or end are active
+    since or until forever, and an event is active from its start up to, but not including, its end.
+    """
+    def __init__(self, events):
+        self.events = events
+        self.length = len(events)
+        self.boundaries = sorted({
+            time for event in events for time in (event.start, event.end) if time is not None
+        })
+        self.windows = [[] for _ in range(len(self.boundaries) + 1)]
+        for event in events:
+            first = 0 if event.start is None else bisect_right(self.boundaries, event.start)
+            last = len(self.boundaries) if event.end is None else bisect_right(self.boundaries, event.end) - 1
+            for window in range(first, last + 1):
+                self.windows[window].append(event)
+        self.__mons = {}
 
-def _make_event_list(pogodata):
-    raw_events = httpget(INFO_URL + "active/events.json").json()
+    @staticmethod
+    def __filter(events, bonus):
+        bonus_types = _bonus_types(bonus)
+        if bonus_types is None:
+            return list(events)
+        return [event for event in events if any(b.type in bonus_types for b in event.bonuses)]
+
+    def active(self, time, bonus=None):
+        """Returns the events active at `time`, optionally only those with one of the `bonus` types"""
+        return self.__filter(self.windows[bisect_right(self.boundaries, time)], bonus)
+
+    def between(self, start, end, bonus=None):
+        """Returns the events active at any time from `start` up to `end`, in list order"""
+        first = bisect_right(self.boundaries, start)
+        last = bisect_left(self.boundaries, end)
+        found = {id(event) for window in self.windows[first:last + 1] for event in window}
+        return self.__filter((event for event in self.events if id(event) in found), bonus)
+
+    def bonuses(self, time, bonus=None):
+        """Returns the :class:`EventBonus` of all events active at `time`"""
+        bonus_types = _bonus_types(bonus)
+        return [
+            b for event in self.active(time) for b in event.bonuses
+            if bonus_types is None or b.type in bonus_types
+        ]
+
+    def next_change(self, time):
+        """Returns the next time the active events change, or None if they never do again"""
+        window = bisect_right(self.boundaries, time)
+        if window < len(self.boundaries):
+            return self.boundaries[window]
+        return None
+
+    def mons(self, time):
+        """Returns the :class:`ActiveMons` of all events active at `time`.
+
+        They're computed once per window, so they're reused until the next event starts or ends.
+        """
+        window = bisect_right(self.boundaries, time)
+        mons = self.__mons.get(window)
+        if mons is None:
+            events = self.windows[window]
+            mons = self.__mons[window] = ActiveMons(*(
+                frozenset(mon for event in events for mon in getattr(event, kind) if mon)
+                for kind in ActiveMons._fields
+            ))
+        return mons
+
+
+def _make_event_list(pogodata, raw_events):
     pogodata.events = []
 
     for raw_event in raw_events:
         event = Event(raw_event)
-        event.spawns = __mon_list(raw_event["spawns"], pogodata.get_mon)
-        event.eggs = __mon_list(raw_event["eggs"], pogodata.get_mon)
-        event.raids = __mon_list(raw_event["raids"], pogodata.get_mon)
-        event.shinies = __mon_list(raw_event["shinies"], pogodata.get_mon)
+        event.spawns = pogodata.get_mons(raw_event["spawns"])
+        event.eggs = pogodata.get_mons(raw_event["eggs"])
+        event.raids = pogodata.get_mons(raw_event["raids"])
+        event.shinies = pogodata.get_mons(raw_event["shinies"])
 
         pogodata.events.append(event)
@@ -0,0 +1,81 @@
+class EvolutionGraph:
+    """Evolutions and families of all Pokémon, built once per reload.
+
+    Nodes are templates. Each template is represented by the first Pokémon with that template,
+    like `get_mon(template=...)` would return it. Families are keyed by the gamemaster's
+    `familyId` (e.g. `FAMILY_BULBASAUR`).
+
+    Attributes
+    ----------
+    next: Dict[:class:`str`, Tuple[:class:`str`]]
+        Maps a template to the templates it directly evolves into.
+    previous: Dict[:class:`str`, :class:`str`]
+        Maps a template to the template it evolves from.
+    families: Dict[:class:`str`, Tuple[:class:`.Pokemon`]]
+        Maps a family ID to all Pokémon of that family, including forms, costumes and Mega Evolutions.
+    """
+    def __init__(self, mons):
+        self.__mons = {}
+        self.__chains = {}
+        self.next = {}
+        self.previous = {}
+
+        families = {}
+        for mon in mons:
+            self.__mons.setdefault(mon.template, mon)
+            if mon.family:
+                families.setdefault(mon.family, []).append(mon)
+        self.families = {family: tuple(members) for family, members in families.items()}
+
+        for template, mon in self.__mons.items():
+            targets = self.__targets(mon)
+            if targets:
+                self.next[template] = targets
+            for target in targets:
+                self.previous.setdefault(target, template)
+
+    @staticmethod
+    def __targets(mon):
+        return tuple(
+            evo.get("form", evo.get("evolution"))
+            for evo in mon.raw.get("evolutionBranch", [])
+            if "temporaryEvolution" not in evo
+        )
+
+    def __chain(self, template):
+        chain = self.__chains.get(template)
+        if chain is None:
+            self.__chains[template] = ()
+            chain = []
+            for target in self.next.get(template, ()):
+                mon = self.__mons.get(target)
+                if mon is not None:
+                    chain.append(mon)
+                    chain += self.__chain(target)
+            chain = self.__chains[template] = tuple(chain)
+        return chain
+
+    def evolutions(self, mon):
+        """All Pokémon `mon` can evolve into, including further evolutions of those"""
+        chain = []
+        for target in self.__targets(mon):
+            evo = self.__mons.get(target)
+            if evo is not None:
+                chain.append(evo)
+                chain += self.__chain(target)
+        return tuple(chain)
+
+    def next_evolutions(self, mon):
+        """The Pokémon `mon` directly evolves into"""
+        return tuple(self.__mons[t] for t in self.next.get(mon.template, ()) if t in self.__mons)
+
+    def pre_evolution(self, mon):
+        """The Pokémon `mon` evolves from, or None"""
+        template = self.previous.get(mon.template)
+        if template is None:
+            return None
+        return self.__mons.get(template)
+
+    def family(self, mon):
+        """All Pokémon in the same family as `mon`. Returns just `mon` if it has no family"""
+        return self.families.get(mon.family, (mon,))
@@ -0,0 +1,203 @@
+import os
+import re
+import json
+import time
+import hashlib
+import tempfile
+from urllib.parse import urlsplit, unquote
+from concurrent.futures import ThreadPoolExecutor
+
+from .misc import HttpTransport, get_repo_content
+
+
+class LocalResponse:
+    def __init__(self, url, content, headers=None):
+        self.url = url
+        self.content = content
+        self.status_code = 200
+        self.headers = headers or {}
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def __bool__(self):
+        return True
+
+
+class LocalTransport:
+    """Serves URLs from local files instead of the network.
+
+    Parameters
+    ----------
+    path: :class:`str`
+        A directory holding one file per URL, laid out as `<host>/<path>`. Query strings are
+        appended to the file name after `%3F`.
+        (e.g. `raw.githubusercontent.com/ccev/pogoinfo/v2/active/raids.json`)
+    files: :class:`dict`
+        Optional mapping of URL to file path, which takes priority over `path`.
+    """
+    def __init__(self, path="", files=None):
+        self.path = path
+        self.files = files or {}
+
+    @staticmethod
+    def filename(url):
+        parts = urlsplit(url)
+        name = os.path.join(parts.netloc, *unquote(parts.path).strip("/").split("/"))
+        if parts.query:
+            name += "%3F" + parts.query
+        return name
+
+    def get(self, url, headers=None):
+        path = self.files.get(url)
+        if path is None:
+            path = os.path.join(self.path, self.filename(url))
+        with open(path, "rb") as handle:
+            return LocalResponse(url, handle.read())
+
+
+class CachedTransport:
+    """Keeps every payload on disk and revalidates it with conditional requests.
+
+    Cached ETag and Last-Modified headers are sent along, and a 304 response is served from disk.
+    URLs matching `immutable` (by default GitHub tree listings, which are keyed on a commit SHA)
+    are served from disk without any request once cached. Only 2xx responses are cached.
+
+    Parameters
+    ----------
+    path: :class:`str`
+        The cache directory. It can be shared between processes.
+    transport:
+        The transport doing the actual requests. Its `get` must accept a `headers` argument.
+        Default: :class:`HttpTransport`
+    """
+    IMMUTABLE = re.compile(r"/git/trees/[0-9a-f]{40}\b")
+
+    def __init__(self, path, transport=None, immutable=IMMUTABLE):
+        self.path = path
+        self.transport = transport or HttpTransport()
+        self.immutable = immutable
+        os.makedirs(path, exist_ok=True)
+
+    def __file(self, url):
+        return os.path.join(self.path, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".cache")
+
+    def __read(self, url):
+        # A record is one line of JSON metadata followed by the body
+        try:
+            with open(self.__file(url), "rb") as handle:
+                meta = json.loads(handle.readline())
+                return meta, handle.read()
+        except (OSError, ValueError):
+            return None, None
+
+    def __write(self, url, response):
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified")
+        }
+        # Write and rename, so concurrent readers never see half a record
+        fd, temp = tempfile.mkstemp(suffix=".tmp", dir=self.path)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(json.dumps(meta).encode("utf-8") + b"\n")
+                handle.write(response.content)
+            os.replace(temp, self.__file(url))
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+    @staticmethod
+    def __cached(url, content):
+        response = LocalResponse(url, content)
+        response.from_cache = True
+        return response
+
+    def get(self, url, headers=None):
+        meta, content = self.__read(url)
+        if meta is not None and self.immutable and self.immutable.search(url):
+            return self.__cached(url, content)
+
+        headers = dict(headers or {})
+        if meta is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = self.transport.get(url, headers=headers)
+        if response.status_code == 304 and meta is not None:
+            return self.__cached(url, content)
+
+        if 200 <= response.status_code < 300:
+            self.__write(url, response)
+        response.from_cache = False
+        return response
+
+
+class Fetcher:
+    """Downloads a set of upstream sources concurrently.
+
+    Parameters
+    ----------
+    transport:
+        Any object with a `get(url)` method returning a response that has `text` and `json()`.
+        Defaults to :class:`HttpTransport`.
+    workers: :class:`int`
+        Maximum number of concurrent downloads. Defaults to one thread per source.
+    hook:
+        Called with `("fetch", data)` after every download, see :class:`.Metrics`.
+    """
+    def __init__(self, transport=None, workers=None, hook=None):
+        self.transport = transport or HttpTransport()
+        self.workers = workers
+        self.hook = hook
+
+    def get(self, url, name=None):
+        hook = self.hook
+        if hook is None:
+            return self.transport.get(url)
+
+        start = time.perf_counter()
+        response = self.transport.get(url)
+        hook("fetch", {
+            "name": name or url,
+            "url": url,
+            "seconds": time.perf_counter() - start,
+            "cached": getattr(response, "from_cache", None)
+        })
+        return response
+
+    def repo_content(self, repo_url, sha_url, name=None):
+        return get_repo_content(repo_url, sha_url, get=lambda url: self.get(url, name))
+
+    def fetch(self, urls, repos=None):
+        """Fetches all sources at once.
+
+        Parameters
+        ----------
+        urls: :class:`dict`
+            Maps a source name to an URL. Results are responses.
+        repos: :class:`dict`
+            Maps a source name to a (tree_url, sha_url) tuple of a GitHub repo.
+            Results are lists of all file paths in that repo.
+
+        Returns
+        -------
+        A dict mapping every source name to its result.
+        """
+        repos = repos or {}
+        jobs = len(urls) + len(repos)
+        if not jobs:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=self.workers or jobs) as pool:
+            futures = {name: pool.submit(self.get, url, name) for name, url in urls.items()}
+            for name, (repo_url, sha_url) in repos.items():
+                futures[name] = pool.submit(self.repo_content, repo_url, sha_url, name)
+            return {name: future.result() for name, future in futures.items()}
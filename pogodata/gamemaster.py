@@ -0,0 +1,92 @@
+import re
+import json
+import hashlib
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+# An anchored pattern can use the buckets if everything up to its first underscore can only
+# ever match a single template token (no dots, groups, classes or \w, which could match "_")
+_PREFIX = re.compile(r"\^((?:[A-Za-z0-9+*?]|\\d|\{\d+(?:,\d*)?\})+)_")
+
+
+def _bucket_prefix(pattern):
+    """Returns the bucket pattern of an anchored pattern, or None if it has to search everything"""
+    if not isinstance(pattern, str):
+        return None
+    match = _PREFIX.match(pattern)
+    if match is None:
+        return None
+    # With a top-level alternative like `^ITEM_|^COMBAT_`, the anchor only holds for one branch
+    if any(op is sre_parse.BRANCH for op, _ in sre_parse.parse(pattern)):
+        return None
+    return match.group(1)
+
+
+class GameMaster:
+    """The gamemaster, bucketed by template family.
+
+    Entries are grouped by the first token of their templateId (`V0001`, `FORMS`, `COMBAT`,
+    `ITEM`, ...), so prefix-anchored patterns like `^V\\d{4}_POKEMON_` only look at their own
+    buckets. There's also a direct lookup by templateId.
+
+    `entries` may be None once the raw gamemaster was released, which searches nothing.
+    """
+    def __init__(self, entries):
+        self.entries = entries
+        self.__templates = {}
+        self.__buckets = {}
+        self.__prefixes = {}
+        self.__digests = {}
+
+        for position, entry in enumerate(entries or ()):
+            template_id = entry.get("templateId", "")
+            self.__templates.setdefault(template_id, position)
+            self.__buckets.setdefault(template_id.split("_", 1)[0], []).append(position)
+
+    def __positions(self, prefix):
+        positions = self.__prefixes.get(prefix)
+        if positions is None:
+            prefix_re = re.compile(prefix)
+            positions = []
+            for key, bucket in self.__buckets.items():
+                if prefix_re.fullmatch(key):
+                    positions += bucket
+            positions.sort()
+            self.__prefixes[prefix] = positions
+        return positions
+
+    def search(self, pattern):
+        """Yields all entries whose templateId matches the regex pattern, in gamemaster order"""
+        prefix = _bucket_prefix(pattern)
+        if prefix is not None:
+            entries = (self.entries[p] for p in self.__positions(prefix))
+        else:
+            entries = self.entries or ()
+
+        pattern = re.compile(pattern)
+        for entry in entries:
+            if pattern.search(entry.get("templateId", "")):
+                yield entry
+
+    def digest(self, prefixes):
+        """Returns a hash over all entries of the buckets whose key fully matches one of the
+        `prefixes` patterns, e.g. `("ITEM",)` or `(r"V\\d{4}", "FORMS")`"""
+        prefixes = tuple(prefixes)
+        digest = self.__digests.get(prefixes)
+        if digest is None:
+            sha = hashlib.sha1()
+            for prefix in prefixes:
+                for position in self.__positions(prefix):
+                    sha.update(json.dumps(self.entries[position], separators=(",", ":")).encode("utf-8"))
+            digest = self.__digests[prefixes] = sha.hexdigest()
+        return digest
+
+    def get(self, template_id):
+        """Returns the entry with this exact templateId, or None"""
+        position = self.__templates.get(template_id)
+        if position is None:
+            return None
+        return self.entries[position]
@@ -1,6 +1,5 @@
 from enum import Enum
 from .objects import GameMasterObject
-from .misc import httpget, INFO_URL
 
 
 class Gender(Enum):
@@ -36,8 +35,7 @@ class Grunt(GameMasterObject):
         return self.__icon.grunt(self)
 
 
-def _make_grunt_list(pogodata):
-    info_grunts = httpget(INFO_URL + "active/grunts.json").json()
+def _make_grunt_list(pogodata, info_grunts):
     pogodata.grunts = []
     enums = pogodata.get_enum("InvasionCharacter")
     for templateid, entry in pogodata.get_gamemaster(r"^CHARACTER_.*", "invasionNpcDisplaySettings"):
@@ -52,7 +50,8 @@ def _make_grunt_list(pogodata):
                     team[i].append(pogodata.get_mon(template=raw_mon["template"]))
 
         grunt = Grunt(pogodata.icon, id_, templateid, entry, grunt_info, team)
-        grunt.name = pogodata.get_locale(grunt.raw.get("trainerName", "combat_grunt_name"))
+        grunt.locale_key = grunt.raw.get("trainerName", "combat_grunt_name")
+        grunt.name = pogodata.get_locale(grunt.locale_key)
 
         if [t for t in grunt.template.split("_") if t in ["EXECUTIVE", "GIOVANNI"]]:
             grunt.boss = True
@@ -1,6 +1,6 @@
 import re
 from enum import Enum
-from .misc import match_enum, get_repo_content
+from .misc import match_enum
 
 
 class IconSet(Enum):
@@ -64,6 +64,23 @@ ICON_DETAILS = {
 }
 
 
+_MON_ICON = re.compile(r"pokemon_icon_(\d+)_(\d+)(?:_(\d+))?\.png$")
+
+
+def _mon_icon_name(monid, form, costume):
+    if form == 0:
+        formstr = "_00"
+    else:
+        formstr = "_" + str(form)
+
+    if costume > 0:
+        costr = "_" + str(costume)
+    else:
+        costr = ""
+
+    return "pokemon_icon_" + str(monid).zfill(3) + formstr + costr + ".png"
+
+
 class Icon:
     def __init__(self, iconset=None):
         if iconset is None:
@@ -75,6 +92,12 @@ class Icon:
         self.url = self.details["url"]
         self.type = self.details["type"]
 
+        # (files_url, sha_url) of the GitHub repo whose file listing is needed to resolve icons
+        self.repo = None
+        self.icons = []
+        # Pokémon icon names and their resolved URLs, both keyed by (id, form, costume). They're
+        # swapped together, so a lookup during a reload never mixes two listings
+        self.__mon_icons = ({}, {})
         if self.type == IconType.PMSF:
             match = re.match(r"https:\/\/raw\.githubusercontent\.com\/([^\/]*)\/([^\/]*)\/([^\/]*).*", self.url)
             user, repo, branch = match.groups()
@@ -82,30 +105,48 @@ class Icon:
             base_api = f"https://api.github.com/repos/{user}/{repo}/"
             sha_url = base_api + f"branches/{branch}"
             files_url = base_api + "git/trees/{sha}?recursive=true"
-            icons = get_repo_content(files_url, sha_url)
-            self.icons = [re.sub(r"[^\/]*\/", "", i) for i in icons]
-        
+            self.repo = (files_url, sha_url)
+
+    def set_listing(self, icons):
+        icons = [re.sub(r"[^\/]*\/", "", i) for i in icons]
+        if icons == self.icons:
+            return
+
+        # Only names pokemon() could ask for, so lookups by key behave like checking the list
+        mon_icons = {}
+        for icon in icons:
+            match = _MON_ICON.match(icon)
+            if match:
+                key = tuple(int(part or 0) for part in match.groups())
+                if _mon_icon_name(*key) == icon:
+                    mon_icons[key] = icon
+        self.icons = icons
+        self.__mon_icons = (mon_icons, {})
+
+    def resolve_all(self, mons):
+        """Resolves the icons of all given Pokémon at once, so `icon_url` is a lookup afterwards"""
+        for mon in mons:
+            self.pokemon(mon)
+
     def pokemon(self, mon):
         if self.type == IconType.POKEMINERS:
             return self.url + "Images/Pokemon/" + mon.asset + ".png"
         elif self.type == IconType.PMSF:
-            for monid in (mon.id, 0):
-                for form in (mon.form, 0):
-                    for costm in (mon.costume.value, 0):
-                        if form == 0:
-                            formstr = "_00"
-                        else:
-                            formstr = "_" + str(form)
-
-                        if costm > 0:
-                            costr = "_" + str(costm)
-                        else:
-                            costr = ""
-    
-                        icon = "pokemon_icon_" + str(monid).zfill(3) + formstr + costr + ".png"
-                        if icon in self.icons:
-                            return self.url + icon
-    
+            mon_icons, urls = self.__mon_icons
+            key = (mon.id, mon.form, mon.costume.value if mon.costume else 0)
+            url = urls.get(key, False)
+            if url is False:
+                url = urls[key] = self.__pmsf_pokemon(mon_icons, *key)
+            return url
+
+    def __pmsf_pokemon(self, mon_icons, mon_id, mon_form, mon_costume):
+        for monid in (mon_id, 0):
+            for form in (mon_form, 0):
+                for costm in (mon_costume, 0):
+                    icon = mon_icons.get((monid, form, costm))
+                    if icon is not None:
+                        return self.url + icon
+
     def item(self, item, amount=1):
         if self.type == IconType.POKEMINERS:
             url = ICON_DETAILS[IconSet.POGO_OPTIMIZED]["url"]
@@ -0,0 +1,152 @@
+import threading
+from enum import Enum
+
+INDEXED_ATTRIBUTES = (
+    "id", "template", "form", "asset", "base_template", "costume", "temp_evolution", "name"
+)
+
+
+class Range:
+    """Matches numbers between `min` and `max`, both included. Either can be None for no limit.
+
+    Can be passed as the value of any query parameter, e.g. `get_move(power=Range(80))`.
+    """
+    __slots__ = ("min", "max")
+
+    def __init__(self, min=None, max=None):
+        self.min = min
+        self.max = max
+
+    def __contains__(self, value):
+        if value is None:
+            return False
+        if isinstance(value, Enum):
+            value = value.value
+        if self.min is not None and value < self.min:
+            return False
+        if self.max is not None and value > self.max:
+            return False
+        return True
+
+    def __repr__(self):
+        return f"Range({self.min}, {self.max})"
+
+
+def _attribute(obj, key):
+    return getattr(obj, key, None)
+
+
+def matches(obj, args):
+    """Checks whether an object matches every key/value pair in args"""
+    for key, value in args.items():
+        big_value = _attribute(obj, key)
+
+        if isinstance(value, Range):
+            if big_value not in value:
+                return False
+        elif isinstance(big_value, (list, tuple)):
+            if not set(value).issubset(set(big_value)):
+                return False
+        elif isinstance(big_value, Enum):
+            if not ((big_value.value == value) or (big_value.name == value) or (big_value == value)):
+                return False
+        elif big_value != value:
+            return False
+    return True
+
+
+def _keys(value):
+    # Enums are matched by member, value or name, so all three point to the same bucket
+    if isinstance(value, Enum):
+        return {value, value.value, value.name}
+    return (value,)
+
+
+class ObjectIndex:
+    """Hash indexes over a list of GameObjects.
+
+    Each attribute maps a value to the positions of all objects holding it, in list order.
+    Indexes are built per attribute on first use and objects appended to the list afterwards
+    are picked up on the next query, so builders can keep querying while they're filling a list.
+    """
+    def __init__(self, objs, attributes=INDEXED_ATTRIBUTES):
+        self.objs = objs
+        self.attributes = attributes
+        self.__indexes = {}
+        self.__length = 0
+        self.__lock = threading.Lock()
+
+    def build(self):
+        with self.__lock:
+            self.__refresh()
+            for attribute in self.attributes:
+                self.__index(attribute)
+
+    def __index(self, attribute):
+        index = self.__indexes.get(attribute)
+        if index is None:
+            index = self.__indexes[attribute] = {}
+            start = 0
+        else:
+            start = self.__length
+        if index is False:
+            return None
+
+        for position in range(start, len(self.objs)):
+            value = _attribute(self.objs[position], attribute)
+            if isinstance(value, (list, tuple)):
+                self.__indexes[attribute] = False
+                return None
+            try:
+                for key in _keys(value):
+                    index.setdefault(key, []).append(position)
+            except TypeError:
+                self.__indexes[attribute] = False
+                return None
+        return index
+
+    def __refresh(self):
+        if self.__length == len(self.objs):
+            return
+        for attribute in self.__indexes:
+            self.__index(attribute)
+        self.__length = len(self.objs)
+
+    def candidates(self, args):
+        """Returns positions of objects that may match args, or None if no index applies"""
+        best = None
+        for key, value in args.items():
+            if key not in self.attributes or isinstance(value, Range):
+                continue
+            with self.__lock:
+                self.__refresh()
+                index = self.__index(key)
+            if index is None:
+                continue
+            try:
+                positions = index.get(value, [])
+            except TypeError:
+                continue
+            if best is None or len(positions) < len(best):
+                best = positions
+            if not best:
+                break
+        return best
+
+    def find(self, args, match_all=False):
+        positions = self.candidates(args)
+        if positions is None:
+            objs = self.objs
+        else:
+            objs = [self.objs[p] for p in positions]
+
+        final = []
+        for obj in objs:
+            if matches(obj, args):
+                if not match_all:
+                    return obj
+                final.append(obj)
+
+        if match_all:
+            return final
+        return None
@@ -0,0 +1,72 @@
+import threading
+
+
+class Metrics:
+    """Collects the events of a :class:`.PogoData` hook.
+
+    Pass an instance as `hook` and read :meth:`report` whenever you want to export the numbers,
+    e.g. to a metrics system. It can also be called from your own hook to keep both.
+
+    A hook is any callable taking `(event, data)`. It may be called from several threads at
+    once and shouldn't raise. Events:
+
+    - `fetch`: `name`, `url`, `seconds` and `cached` (True/False with a `cache_dir`, else None)
+    - `stage`: `stage`, `seconds` and `objects` for every part of a reload, e.g. `gamemaster` or `mons`
+    - `reload`: `seconds` and `subsystems` of a whole reload
+    - `query`: `name` of the list, `args` (the attribute names), `scanned`, `found` and `seconds`
+    - `enum`: `enum`, `values` and `seconds` of a `get_enum` call
+    - `gamemaster`: `pattern`, `found` and `seconds` of a `get_gamemaster` call
+    """
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.__lock:
+            self.stages = {}
+            self.fetches = {}
+            self.reloads = []
+            self.queries = {}
+            self.enums = {}
+            self.gamemaster = {"calls": 0, "found": 0, "seconds": 0}
+            self.cache = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def __count(counters, key, data, *fields):
+        counter = counters.setdefault(key, dict.fromkeys(("calls",) + fields, 0))
+        counter["calls"] += 1
+        for field in fields:
+            counter[field] += data[field]
+
+    def __call__(self, event, data):
+        with self.__lock:
+            if event == "fetch":
+                self.fetches[data["url"]] = {"name": data["name"], "seconds": data["seconds"]}
+                if data["cached"] is not None:
+                    self.cache["hits" if data["cached"] else "misses"] += 1
+            elif event == "stage":
+                self.stages[data["stage"]] = {"seconds": data["seconds"], "objects": data["objects"]}
+            elif event == "reload":
+                self.reloads.append(data["seconds"])
+            elif event == "query":
+                self.__count(self.queries, data["name"], data, "scanned", "found", "seconds")
+            elif event == "enum":
+                self.__count(self.enums, data["enum"], data, "seconds")
+            elif event == "gamemaster":
+                self.gamemaster["calls"] += 1
+                self.gamemaster["found"] += data["found"]
+                self.gamemaster["seconds"] += data["seconds"]
+
+    def report(self):
+        """Returns all numbers as a dict. Stages and fetches are the ones of the last reload"""
+        with self.__lock:
+            cache_total = self.cache["hits"] + self.cache["misses"]
+            return {
+                "stages": {name: dict(stage) for name, stage in self.stages.items()},
+                "fetches": {url: dict(fetch) for url, fetch in self.fetches.items()},
+                "reloads": list(self.reloads),
+                "queries": {name: dict(query) for name, query in self.queries.items()},
+                "enums": {name: dict(enum) for name, enum in self.enums.items()},
+                "gamemaster": dict(self.gamemaster),
+                "cache": {**self.cache, "hit_rate": self.cache["hits"] / cache_total if cache_total else None}
+            }
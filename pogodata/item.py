@@ -4,12 +4,14 @@ from .objects import GameMasterObject
 
 
 class Item(GameMasterObject):
+    __slots__ = ("min_level", "type", "category", "food_effects", "amount", "reward_type", "__icon")
+
     def __init__(self, icon, id_, template, gm_entry):
         super().__init__(id_, template, gm_entry)
         self.min_level = gm_entry.get("dropTrainerLevel", 0)
         self.type = None
         self.category = None
-        self.food_effects = []
+        self.food_effects = ()
 
         self.__icon = icon
 
@@ -40,6 +42,7 @@ def _make_item_list(pogodata):
         else:
             locale_key = f"{template}_name"
 
+        item.locale_key = locale_key
         item.name = pogodata.get_locale(locale_key)
 
         raw_food_effects = entry.get("food")
@@ -47,8 +50,6 @@ def _make_item_list(pogodata):
             effects = raw_food_effects.get("itemEffect")
             if not effects:
                 continue
-            for i, template in enumerate(effects):
-                percent = raw_food_effects["itemEffectPercent"][i]
-                item.food_effects.append((template, percent))
+            item.food_effects = tuple(zip(effects, raw_food_effects["itemEffectPercent"]))
 
         pogodata.items.append(item)
@@ -0,0 +1,89 @@
+import io
+import sys
+from collections.abc import Mapping
+
+_KEY = "RESOURCE ID: "
+_TEXT = "TEXT: "
+
+
+def parse_locale(lines):
+    """Yields (key, text) pairs from the lines of an in-game text file, in a single pass.
+
+    `lines` can be any iterable of strings, e.g. an open file.
+    """
+    key = None
+    for line in lines:
+        position = line.find(_KEY)
+        if position != -1:
+            key = line[position + len(_KEY):].rstrip("\r\n")
+            continue
+        position = line.find(_TEXT)
+        if position != -1 and key is not None:
+            yield key, line[position + len(_TEXT):].rstrip("\r\n")
+            key = None
+
+
+def response_lines(response):
+    """Iterates over the lines of a downloaded text file without decoding it as a whole"""
+    return io.TextIOWrapper(io.BytesIO(response.content), encoding="utf-8", newline="")
+
+
+class LocaleStore:
+    """Translations of any number of languages.
+
+    All languages share one table of keys. Every language is a column in that table, so each
+    key is only stored once no matter how many languages are loaded.
+    """
+    def __init__(self):
+        self.keys = {}
+        self.columns = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def languages(self):
+        return list(self.columns)
+
+    def add(self, language, pairs):
+        """Adds (key, text) pairs to a language, replacing existing translations"""
+        column = self.columns.setdefault(language.lower(), [])
+        for key, text in pairs:
+            row = self.keys.get(key)
+            if row is None:
+                row = self.keys[sys.intern(key)] = len(self.keys)
+            if row >= len(column):
+                column.extend([None] * (row - len(column) + 1))
+            column[row] = text
+
+    def get(self, key, language, default=None):
+        column = self.columns.get(language.lower())
+        if column is None:
+            raise ValueError(f"Language {language} isn't loaded")
+        row = self.keys.get(key)
+        if row is None or row >= len(column):
+            return default
+        text = column[row]
+        return default if text is None else text
+
+
+class LocaleView(Mapping):
+    """The translations of one language of a :class:`LocaleStore`, as a read-only dict of key to text"""
+    def __init__(self, store, language):
+        self.store = store
+        self.column = store.columns.get(language.lower(), [])
+
+    def __getitem__(self, key):
+        row = self.store.keys.get(key)
+        if row is None or row >= len(self.column) or self.column[row] is None:
+            raise KeyError(key)
+        return self.column[row]
+
+    def __iter__(self):
+        column = self.column
+        for key, row in self.store.keys.items():
+            if row < len(column) and column[row] is not None:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
@@ -0,0 +1,60 @@
+import sys
+import types
+from enum import Enum
+
+from .objects import GameMasterObject
+
+# Shared by everything and not owned by any data
+_SKIPPED = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType, Enum)
+
+
+def _slots(cls):
+    for klass in cls.__mro__:
+        for slot in klass.__dict__.get("__slots__", ()):
+            if slot.startswith("__") and not slot.endswith("__"):
+                slot = f"_{klass.__name__.lstrip('_')}{slot}"
+            yield slot
+
+
+def deep_size(obj, seen):
+    """Returns the approximate size of `obj` and everything it references, in bytes.
+
+    Objects whose id is in `seen` are skipped, and everything counted is added to it. Passing
+    the same set to several calls counts shared objects only once.
+    """
+    size = 0
+    pending = [obj]
+    while pending:
+        obj = pending.pop()
+        if obj is None or id(obj) in seen or isinstance(obj, _SKIPPED):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            pending += obj.keys()
+            pending += obj.values()
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            pending += obj
+        elif isinstance(obj, (str, bytes, bytearray, int, float, bool, memoryview)):
+            continue
+        else:
+            attributes = getattr(obj, "__dict__", None)
+            if attributes is not None:
+                pending.append(attributes)
+            for slot in _slots(type(obj)):
+                try:
+                    pending.append(object.__getattribute__(obj, slot))
+                except AttributeError:
+                    pass
+    return size
+
+
+def owned_raw(obj):
+    """Returns the raw data an object holds itself, not through the object it's a variant of"""
+    if not isinstance(obj, GameMasterObject):
+        return None
+    try:
+        return GameMasterObject._raw.__get__(obj)
+    except AttributeError:
+        return None
@@ -1,7 +1,9 @@
 import requests
+import random
 import time
 from enum import Enum
 from datetime import datetime
+from requests.adapters import HTTPAdapter
 
 INFO_URL = "https://raw.githubusercontent.com/ccev/pogoinfo/v2/"
 PROTO_URL = "https://raw.githubusercontent.com/Furtif/POGOProtos/master/base/base.proto"
@@ -13,16 +15,87 @@ INGAME_ICONS = "https://api.github.com/repos/PokeMiners/pogo_assets/git/trees/{s
 ICON_SHA = "https://api.github.com/repos/PokeMiners/pogo_assets/branches/master"
 
 
+class FetchError(Exception):
+    """Raised when an URL couldn't be fetched within the retry budget"""
+    def __init__(self, url, reason):
+        super().__init__(f"Failed to fetch {url}: {reason}")
+        self.url = url
+        self.reason = reason
+
+
+class HttpTransport:
+    """Fetches URLs over a pooled keep-alive session with bounded retries.
+
+    Parameters
+    ----------
+    timeout: :class:`tuple`
+        (connect, read) timeout in seconds.
+    retries: :class:`int`
+        How often a failed request is retried before :class:`FetchError` is raised.
+    backoff: :class:`float`
+        Base delay in seconds. Retries wait a random time up to backoff * 2^attempt.
+    max_backoff: :class:`float`
+        Upper limit for a single delay.
+    pool_size: :class:`int`
+        Number of keep-alive connections kept per host.
+    rewrite: :class:`dict`
+        Maps URL prefixes to replacements, e.g. to point remote hosts to a local stub server:
+        `{"https://raw.githubusercontent.com/": "http://localhost:8000/"}`
+    """
+    RETRY_STATUS = (408, 429, 500, 502, 503, 504)
+
+    def __init__(self, timeout=(5, 60), retries=4, backoff=1, max_backoff=60, pool_size=10, rewrite=None):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.rewrite = rewrite or {}
+
+        self.session = requests.Session()
+        self.session.headers["Accept-Encoding"] = "gzip, deflate"
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def url(self, url):
+        for prefix, replacement in self.rewrite.items():
+            if url.startswith(prefix):
+                return replacement + url[len(prefix):]
+        return url
+
+    def delay(self, attempt, response=None):
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(int(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def get(self, url, headers=None):
+        url = self.url(url)
+        reason = None
+        for attempt in range(self.retries + 1):
+            response = None
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                reason = e
+            else:
+                if response.status_code < 400:
+                    return response
+                reason = f"HTTP {response.status_code}"
+                if response.status_code not in self.RETRY_STATUS:
+                    break
+
+            if attempt < self.retries:
+                time.sleep(self.delay(attempt, response))
+        raise FetchError(url, reason)
+
+
+_transport = HttpTransport()
+
+
 def httpget(url):
-    result = None
-    while not result:
-        try:
-            result = requests.get(url)
-        except Exception:
-            pass
-        if not result:
-            time.sleep(60)
-    return result
+    return _transport.get(url)
 
 
 def get_commit_date(url, branch="master"):
@@ -54,11 +127,11 @@ def match_enum(enum, value):
     return type_
 
 
-def get_repo_content(repo_url, sha_url):
-    master = httpget(sha_url).json()
+def get_repo_content(repo_url, sha_url, get=httpget):
+    master = get(sha_url).json()
     sha = master["commit"]["sha"]
     new_url = repo_url.format(sha=sha)
-    icons = httpget(new_url).json()["tree"]
+    icons = get(new_url).json()["tree"]
     icons = [i["path"] for i in icons]
     return icons
 
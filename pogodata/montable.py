@@ -0,0 +1,153 @@
+from enum import Enum
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# The attributes a key is made of, in this order
+KEY_ATTRIBUTES = ("id", "form", "costume", "temp_evolution")
+
+_BITS = 16
+_LIMIT = (1 << _BITS) - 1
+
+
+def _field(value):
+    # Values are stored +1, so 0 is left for Pokémon that have an attribute set to None
+    if value is None:
+        return 0
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, bool) or not isinstance(value, int) or not 0 <= value < _LIMIT:
+        raise ValueError(f"{value!r} can't be part of a Pokémon key")
+    return value + 1
+
+
+def _pack(fields, mask):
+    packed = 0
+    for i, field in enumerate(fields):
+        if mask & (1 << i):
+            packed |= field << (_BITS * i)
+    return packed
+
+
+def is_array(keys):
+    return np is not None and isinstance(keys, np.ndarray)
+
+
+def key_args(key):
+    """Returns a key as parameters of :meth:`.PogoData.get_mon`"""
+    if isinstance(key, dict):
+        return key
+    if isinstance(key, int):
+        key = (key,)
+    return {attribute: value for attribute, value in zip(KEY_ATTRIBUTES, key) if value is not None}
+
+
+def _parse_key(key):
+    """Returns (fields, mask) of a key, or None if it has values the table can't look up"""
+    if isinstance(key, dict):
+        if not set(key).issubset(KEY_ATTRIBUTES):
+            return None
+        key = [key.get(attribute) for attribute in KEY_ATTRIBUTES]
+    elif isinstance(key, int):
+        key = (key,)
+    elif len(key) > len(KEY_ATTRIBUTES):
+        raise ValueError(f"Keys have at most {len(KEY_ATTRIBUTES)} values: {KEY_ATTRIBUTES}")
+
+    fields = []
+    mask = 0
+    for i, value in enumerate(key):
+        if value is None:
+            fields.append(0)
+            continue
+        try:
+            fields.append(_field(value))
+        except ValueError:
+            return None
+        mask |= 1 << i
+    return fields, mask
+
+
+class MonTable:
+    """Resolves many Pokémon keys at once.
+
+    A key is `(id, form, costume, temp_evolution)`. Values can be left out or None to match any
+    value, like leaving out a parameter of :meth:`.PogoData.get_mon`, which also makes the first
+    Pokémon in list order win. All four attributes of a Pokémon are packed into one integer.
+    Each combination of given attributes gets its own table of packed keys, built on first use.
+    """
+    def __init__(self, mons):
+        self.mons = mons
+        self.rows = [[_field(getattr(mon, attribute, None)) for attribute in KEY_ATTRIBUTES] for mon in mons]
+        self.__tables = {}
+        self.__arrays = {}
+
+    def __table(self, mask):
+        table = self.__tables.get(mask)
+        if table is None:
+            table = {}
+            for position, fields in enumerate(self.rows):
+                table.setdefault(_pack(fields, mask), position)
+            # Like get_mon, a key whose first match has no ID (e.g. the unset Pokémon) finds nothing
+            for key, position in table.items():
+                if not self.mons[position]:
+                    table[key] = -1
+            self.__tables[mask] = table
+        return table
+
+    def __array(self, mask):
+        # Sorted packed keys and their positions, for searchsorted
+        arrays = self.__arrays.get(mask)
+        if arrays is None:
+            table = self.__table(mask)
+            keys = np.fromiter(table.keys(), dtype=np.uint64, count=len(table))
+            positions = np.fromiter(table.values(), dtype=np.intp, count=len(table))
+            order = np.argsort(keys)
+            arrays = self.__arrays[mask] = (keys[order], positions[order])
+        return arrays
+
+    def position(self, key):
+        """Returns the position of the first Pokémon matching `key`, -1 if there is none, or None
+        if the key holds values the table can't resolve (e.g. names), so it has to be searched."""
+        parsed = _parse_key(key)
+        if parsed is None:
+            return None
+        fields, mask = parsed
+        return self.__table(mask).get(_pack(fields, mask), -1)
+
+    def positions(self, keys):
+        """Returns the positions for many keys, like :meth:`position`.
+
+        `keys` can also be an integer array of shape (n, 1 to 4), where -1 matches any value. The
+        result is then an array, with -1 for keys without a match.
+        """
+        if is_array(keys):
+            return self.__positions_array(keys)
+        return [self.position(key) for key in keys]
+
+    def __positions_array(self, keys):
+        keys = np.asarray(keys, dtype=np.int64)
+        if keys.ndim == 1:
+            keys = keys[:, np.newaxis]
+        if keys.ndim != 2 or keys.shape[1] > len(KEY_ATTRIBUTES):
+            raise ValueError(f"Keys have to be of shape (n, 1 to {len(KEY_ATTRIBUTES)})")
+
+        given = keys != -1
+        valid = np.all((keys >= -1) & (keys < _LIMIT), axis=1)
+        fields = np.where(given, keys + 1, 0).astype(np.uint64)
+        masks = (given << np.arange(keys.shape[1])).sum(axis=1)
+        packed = (fields << (np.arange(keys.shape[1], dtype=np.uint64) * np.uint64(_BITS))).sum(
+            axis=1, dtype=np.uint64
+        )
+
+        result = np.full(len(keys), -1, dtype=np.intp)
+        for mask in np.unique(masks[valid]):
+            rows = np.flatnonzero(valid & (masks == mask))
+            table_keys, table_positions = self.__array(int(mask))
+            if not len(table_keys):
+                continue
+            found = np.minimum(np.searchsorted(table_keys, packed[rows]), len(table_keys) - 1)
+            hit = table_keys[found] == packed[rows]
+            result[rows[hit]] = table_positions[found[hit]]
+        return result
@@ -3,6 +3,8 @@ from .objects import GameMasterObject
 
 
 class Move(GameMasterObject):
+    __slots__ = ("type", "power", "energy_delta", "buffs")
+
     def __init__(self, template, gamemaster_entry, move_id):
         super().__init__(move_id, template, gamemaster_entry)
         self.type = None
@@ -20,5 +22,6 @@ def _make_move_list(pogodata):
         move_id = move_enum.get(template, 0)
         move = Move(template, entry, move_id)
         move.type = pogodata.get_type(template=move.raw.get("type"))
-        move.name = pogodata.get_locale("move_name_" + str(move.id).zfill(4))
+        move.locale_key = "move_name_" + str(move.id).zfill(4)
+        move.name = pogodata.get_locale(move.locale_key)
         pogodata.moves.append(move)
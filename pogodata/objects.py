@@ -1,4 +1,6 @@
-from copy import deepcopy
+import sys
+import json
+import zlib
 from enum import Enum
 
 
@@ -7,16 +9,46 @@ class BasicType(Enum):
     SET = 1
 
 
+class RawMode(Enum):
+    KEEP = 0
+    COMPRESS = 1
+    DROP = 2
+
+
 class _CopyableClass():
+    __slots__ = ("_base",)
+
     def copy(self):
-        return deepcopy(self)
+        """Returns a variant of this object.
+
+        The variant shares all data with the original and only stores attributes that are set on
+        it afterwards (e.g. costume or level). Everything else, including moves and types, is read
+        from the original, so identity checks against shared objects keep working.
+        """
+        variant = object.__new__(type(self))
+        variant._base = self
+        return variant
+
+    def __getattr__(self, name):
+        # Only called for attributes a variant doesn't set itself
+        if name == "_base" or name.startswith("__"):
+            raise AttributeError(name)
+        try:
+            base = self._base
+        except AttributeError:
+            raise AttributeError(name) from None
+        return getattr(base, name)
 
 
 class GameObject(_CopyableClass):
+    __slots__ = ("id", "template", "name", "locale_key")
+
     def __init__(self, id_, template):
         self.id = id_
-        self.template = template
+        self.template = sys.intern(template)
         self.name = "?"
+        # The key of the name in the in-game texts, to look it up in other languages
+        self.locale_key = None
     
     def __str__(self):
         return self.template
@@ -26,6 +58,8 @@ class GameObject(_CopyableClass):
 
 
 class GameMasterObject(GameObject):
+    __slots__ = ("_raw",)
+
     def __init__(self, id_, template, gamemaster_entry, settings_name=""):
         super().__init__(id_, template)
         if "data" in gamemaster_entry:
@@ -33,8 +67,34 @@ class GameMasterObject(GameObject):
         else:
             self.raw = gamemaster_entry
 
+    @property
+    def raw(self):
+        raw = self._raw
+        if raw is None:
+            return {}
+        if isinstance(raw, bytes):
+            return json.loads(zlib.decompress(raw))
+        return raw
+
+    @raw.setter
+    def raw(self, value):
+        self._raw = value
+
+    def compact_raw(self, mode):
+        """Compresses or drops the raw gamemaster entry, if this object holds one itself"""
+        try:
+            raw = GameMasterObject._raw.__get__(self)
+        except AttributeError:
+            return
+        if mode == RawMode.DROP:
+            self._raw = None
+        elif mode == RawMode.COMPRESS and isinstance(raw, dict):
+            self._raw = zlib.compress(json.dumps(raw, separators=(",", ":")).encode("utf-8"))
+
 
 class Type(GameObject):
+    __slots__ = ("__icon",)
+
     def __init__(self, icon, id_, template):
         super().__init__(id_, template)
         self.__icon = icon
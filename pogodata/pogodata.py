@@ -1,12 +1,14 @@
-import pickle
-import re
+import time
+import hashlib
+import threading
 
-from datetime import datetime
+from copy import copy
+from datetime import datetime, timedelta
 
 from enum import Enum
-from .misc import httpget, PROTO_URL, GAMEMASTER_URL, LOCALE_URL, REMOTE_LOCALE_URL, INFO_URL
-from .objects import Type
-from .pokemon import _make_mon_list, Pokemon
+from .misc import match_enum, PROTO_URL, GAMEMASTER_URL, LOCALE_URL, REMOTE_LOCALE_URL, INFO_URL, INGAME_ICONS, ICON_SHA
+from .objects import Type, RawMode
+from .pokemon import _make_mon_list, Pokemon, PokemonType
 from .event import _make_event_list, Event
 from .item import _make_item_list, Item
 from .grunt import _make_grunt_list, Grunt
@@ -15,11 +17,100 @@ from .move import _make_move_list, Move
 from .weather import _make_weather_list, Weather
 from .quest import _make_quest_list, Quest
 from .icons import Icon
+from .index import matches
+from .montable import is_array, key_args
+from .snapshot import Snapshot, save_snapshot, load_snapshot
+from .protos import Protos
+from .fetch import Fetcher, CachedTransport
+from .locale import LocaleStore, LocaleView, parse_locale, response_lines
+from .memory import deep_size, owned_raw
+from .changes import diff_snapshots
 
 
-def load_pogodata(path="", name="__pogodata_save__"):
-    with open(f"{path}{name}.pickle", "rb") as handle:
-        return pickle.load(handle)
+def load_pogodata(path="", name="__pogodata_save__", **kwargs):
+    """Loads data saved with :meth:`PogoData.save`.
+
+    Keyword arguments are passed to :class:`PogoData` and override the saved settings.
+    Raises :class:`.SnapshotError` if the file was written by an incompatible version or is corrupt.
+    Sections of the file that are loaded on first access raise it then.
+    """
+    snapshot, config = load_snapshot(f"{path}{name}.snapshot")
+    return PogoData(**{**config, **kwargs, "snapshot": snapshot})
+
+
+# Every subsystem with the sources it's built from and the subsystems it depends on, in build order.
+# The protos, gamemaster and locales are always loaded.
+SUBSYSTEMS = {
+    "types": ((), ()),
+    "items": ((), ()),
+    "weather": ((), ("types",)),
+    "moves": ((), ("types",)),
+    "mons": (("ingame_icons", "icons"), ("types", "moves")),
+    "quests": (("quests",), ("items", "mons")),
+    "raids": (("raids",), ("mons",)),
+    "grunts": (("grunts",), ("types", "mons")),
+    "events": (("events",), ("mons",))
+}
+
+# Other snapshot attributes made by a subsystem
+SUBSYSTEM_ATTRIBUTES = {
+    "mons": ("evolution_graph",)
+}
+
+# The gamemaster buckets (see GameMaster) a subsystem reads. Only changes in these rebuild it
+SUBSYSTEM_TEMPLATES = {
+    "items": ("ITEM",),
+    "weather": ("WEATHER",),
+    "moves": ("COMBAT",),
+    "mons": (r"V\d{4}", "FORMS", "TEMPORARY"),
+    "grunts": ("CHARACTER",)
+}
+
+# Subsystems of GameMasterObjects, whose raw data is compacted according to raw_mode
+_RAW_SUBSYSTEMS = ("items", "weather", "moves", "mons", "grunts")
+
+
+def _resolve_subsystems(names):
+    """Returns the given subsystems and all their dependencies, in build order"""
+    needed = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name not in SUBSYSTEMS:
+            raise ValueError(f"Unknown subsystem {name}. Available: {', '.join(SUBSYSTEMS)}")
+        if name not in needed:
+            needed.add(name)
+            pending += SUBSYSTEMS[name][1]
+    return [name for name in SUBSYSTEMS if name in needed]
+
+
+def _digest(source):
+    if isinstance(source, list):
+        content = "\n".join(source).encode("utf-8")
+    else:
+        content = source.content
+    return hashlib.sha1(content).hexdigest()
+
+
+def _snapshot_attribute(name):
+    return property(
+        lambda self: getattr(self._snapshot, name),
+        lambda self, value: setattr(self._snapshot, name, value)
+    )
+
+
+def _subsystem_attribute(name, subsystem=None):
+    subsystem = subsystem or name
+
+    def getter(self):
+        snapshot = self._snapshot
+        value = getattr(snapshot, name)
+        if value is None:
+            self._require(snapshot, subsystem)
+            value = getattr(snapshot, name)
+        return value
+
+    return property(getter, lambda self, value: setattr(self._snapshot, name, value))
 
 
 class PogoData:
@@ -30,8 +121,37 @@ class PogoData:
     language: :class:`str`
         The language used for translations. Default: english
         Available languages: https://github.com/PokeMiners/pogo_assets/tree/master/Texts/Latest%20APK/JSON
+    languages: List[:class:`str`]
+        Additional languages to load. Use them with `get_locale(key, language)` and `get_name(obj, language)`.
+    subsystems: List[:class:`str`]
+        The subsystems to build on every reload, e.g. `["items", "moves"]`. Their dependencies are
+        built too. All others are built on first access, and only their sources are downloaded
+        then. Available: types, items, weather, moves, mons, quests, raids, grunts, events.
+        Default: all
     icon_url: :class:`str`
         An URL to the base of an UIcons-compatible icon repo for UIcon support.
+    transport:
+        Used to download all upstream data. Any object with a `get(url)` method, e.g. a tuned
+        :class:`.HttpTransport` or a :class:`.LocalTransport` to serve data from local files.
+        Default: :class:`.HttpTransport` with its default settings
+    cache_dir: :class:`str`
+        A directory to keep downloaded data in. Unchanged data is then revalidated with conditional
+        requests instead of being downloaded again. See :class:`.CachedTransport`
+    background: :class:`bool`
+        If True, updates due after `update_interval` are built in a background thread and swapped
+        in once complete, so queries never wait for them. The first load still happens on init.
+        Default: False
+    raw_mode: :class:`str`
+        What happens to the raw gamemaster entries kept on objects after a reload. `keep` them,
+        `compress` them (decompressed on every access of `raw`) or `drop` them. Default: keep
+    keep_raw_sources: :class:`bool`
+        If False, all subsystems are built on every reload and the raw protos and gamemaster are
+        released afterwards. See :meth:`release_raw`. Default: True
+    hook:
+        Called with `(event, data)` for every reload stage, download and query, e.g. a
+        :class:`.Metrics` instance. Nothing is measured without a hook.
+    snapshot: :class:`.Snapshot`
+        Data to start with instead of downloading it. Used by :func:`load_pogodata`
 
     Attributes
     ----------
@@ -45,104 +165,598 @@ class PogoData:
         All Moves.
     grunts: List[:class:`.grunts.Grunt`]
         All Grunts.
+    evolution_graph: :class:`.EvolutionGraph`
+        Evolutions and families of all Pokémon.
+    locale: :class:`.LocaleView`
+        The in-game texts of the main language, as a read-only dict of key to text.
+    locales: :class:`.LocaleStore`
+        The in-game texts of all loaded languages.
+    last_error: :class:`Exception`
+        The error of the last failed background refresh, None if it succeeded.
     """
-    def __init__(self, language="english", update_interval=24, icons=None):
-        self.__make_locale_url(language)
+    # A failed update is retried after this many hours at most
+    RETRY_INTERVAL = 1
+
+    icon = _snapshot_attribute("icon")
+    raw_protos = _snapshot_attribute("raw_protos")
+    protos = _snapshot_attribute("protos")
+    raw_gamemaster = _snapshot_attribute("raw_gamemaster")
+    locales = _snapshot_attribute("locale")
+    updated = _snapshot_attribute("updated")
+    types = _subsystem_attribute("types")
+    items = _subsystem_attribute("items")
+    weather = _subsystem_attribute("weather")
+    moves = _subsystem_attribute("moves")
+    mons = _subsystem_attribute("mons")
+    quests = _subsystem_attribute("quests")
+    raids = _subsystem_attribute("raids")
+    grunts = _subsystem_attribute("grunts")
+    events = _subsystem_attribute("events")
+    evolution_graph = _subsystem_attribute("evolution_graph", "mons")
+
+    @property
+    def locale(self):
+        return LocaleView(self.locales, self.language)
+
+    def __init__(self, language="english", update_interval=24, icons=None, transport=None, cache_dir=None,
+                 background=False, raw_mode=RawMode.KEEP, snapshot=None, languages=None, subsystems=None,
+                 hook=None, keep_raw_sources=True):
+        self.languages = []
+        self.__set_languages(language, languages or [])
         self.update_interval = update_interval
+        self.background = background
+        self.raw_mode = match_enum(RawMode, raw_mode)
+        self.keep_raw_sources = keep_raw_sources
+        self.last_error = None
         self.__iconset = icons
-        self.reload()
+        if cache_dir:
+            transport = CachedTransport(cache_dir, transport)
+        self.hook = hook
+        self.__fetcher = Fetcher(transport, hook=hook)
+        self.subsystems = _resolve_subsystems(SUBSYSTEMS if subsystems is None else subsystems)
+
+        self.__build_lock = threading.RLock()
+        self.__refresh_lock = threading.Lock()
+        self.__refresh_thread = None
+        self.__next_update = None
+        self.__subscribers = []
+        self._snapshot = Snapshot()
+        if snapshot is None:
+            self.reload()
+        else:
+            self.__swap(snapshot)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_PogoData__build_lock"] = None
+        state["_PogoData__refresh_lock"] = None
+        state["_PogoData__refresh_thread"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__build_lock = threading.RLock()
+        self.__refresh_lock = threading.Lock()
+
+    def __set_languages(self, language, languages):
+        self.language = language.lower()
+        # The main language first, then all others in the order they were added
+        self.languages = [self.language] + [
+            lang for lang in dict.fromkeys(lang.lower() for lang in self.languages[1:] + list(languages))
+            if lang != self.language
+        ]
+
+    def __locale_sources(self):
+        return [source + language for language in self.languages for source in ("apk_locale_", "remote_locale_")]
+
+    def __fetch_sources(self, icon, subsystems, core=True):
+        urls = {
+            "protos": PROTO_URL,
+            "gamemaster": GAMEMASTER_URL,
+            "raids": INFO_URL + "active/raids.json",
+            "quests": INFO_URL + "active/quests.json",
+            "grunts": INFO_URL + "active/grunts.json",
+            "events": INFO_URL + "active/events.json"
+        }
+        core_sources = ["protos", "gamemaster"] + self.__locale_sources()
+        for language in self.languages:
+            lang = language.capitalize()
+            urls["apk_locale_" + language] = LOCALE_URL.format(lang=lang)
+            urls["remote_locale_" + language] = REMOTE_LOCALE_URL.format(lang=lang)
+        repos = {"ingame_icons": (INGAME_ICONS, ICON_SHA)}
+        if icon.repo:
+            repos["icons"] = icon.repo
+
+        needed = {source for name in subsystems for source in SUBSYSTEMS[name][0]}
+        if core:
+            needed.update(core_sources)
+        return self.__fetcher.fetch(
+            {name: url for name, url in urls.items() if name in needed},
+            {name: repo for name, repo in repos.items() if name in needed}
+        )
+
+    def __builder(self, snapshot):
+        # The builders work on a copy of this object that reads from and writes to `snapshot`
+        builder = copy(self)
+        builder.update_interval = 0
+        builder._snapshot = snapshot
+        return builder
+
+    def __stage(self, stage, function, *args):
+        """Runs one stage of a reload and reports its time and object count to the hook"""
+        hook = self.hook
+        if hook is None:
+            return function(*args)
+
+        start = time.perf_counter()
+        result = function(*args)
+        seconds = time.perf_counter() - start
+        try:
+            objects = len(result)
+        except TypeError:
+            objects = None
+        hook("stage", {"stage": stage, "seconds": seconds, "objects": objects})
+        return result
+
+    def __build_subsystems(self, builder, subsystems, sources):
+        for name in subsystems:
+            self.__stage(name, self.__build_subsystem, builder, name, sources)
+
+    def __build_subsystem(self, builder, name, sources):
+        snapshot = builder._snapshot
+        if name == "types":
+            snapshot.types = builder.__make_simple_gameobject_list(
+                "HoloPokemonType",
+                "{template}",
+                Type
+            )
+        elif name == "items":
+            _make_item_list(builder)
+        elif name == "weather":
+            _make_weather_list(builder)
+        elif name == "moves":
+            _make_move_list(builder)
+        elif name == "mons":
+            if "icons" in sources:
+                snapshot.icon.set_listing(sources["icons"])
+            _make_mon_list(builder, sources["ingame_icons"])
+            snapshot.icon.resolve_all(snapshot.mons)
+        elif name == "quests":
+            _make_quest_list(builder, sources["quests"].json())
+        elif name == "raids":
+            _make_raid_list(builder, sources["raids"].json())
+        elif name == "grunts":
+            _make_grunt_list(builder, sources["grunts"].json())
+        elif name == "events":
+            _make_event_list(builder, sources["events"].json())
+
+        if name in _RAW_SUBSYSTEMS and self.raw_mode != RawMode.KEEP:
+            for obj in getattr(snapshot, name):
+                obj.compact_raw(self.raw_mode)
+        return getattr(snapshot, name)
+
+    def __build(self, subsystems, previous=None, only=None):
+        """Downloads everything and builds a new snapshot without touching the current one.
+
+        With a `previous` snapshot, only subsystems whose sources or gamemaster entries changed are
+        rebuilt, together with everything depending on them. All others are taken over. With
+        `only`, just the sources of those subsystems are downloaded and the rest is kept.
+        """
+        start = time.perf_counter()
+        if not self.keep_raw_sources:
+            # Nothing can be built on access once the raw data is gone
+            subsystems = list(SUBSYSTEMS)
+        icon = Icon(self.__iconset)
+        if previous is not None and (previous.hashes is None or previous.icon.set != icon.set):
+            previous = None
+        if previous is None or any(name not in previous.hashes for name in self.__locale_sources()):
+            # New languages or icons need a full download
+            only = None
+
+        if only is None:
+            sources = self.__stage("fetch", self.__fetch_sources, icon, subsystems)
+        else:
+            only = [name for name in _resolve_subsystems(only) if name in only]
+            sources = self.__stage("fetch", self.__fetch_sources, icon, only, False)
+        hashes = dict(previous.hashes) if previous is not None else {}
+        hashes.update((name, _digest(source)) for name, source in sources.items())
+
+        def unchanged(*names):
+            return previous is not None and all(previous.hashes.get(name) == hashes.get(name) for name in names)
 
-    def __make_locale_url(self, language):
-        lang = language.lower().capitalize()
-        self.__locale_url = LOCALE_URL.format(lang=lang)
-        self.__remote_locale_url = REMOTE_LOCALE_URL.format(lang=lang)
+        snapshot = Snapshot()
+        snapshot.hashes = hashes
+        snapshot.updated = datetime.utcnow() if only is None else previous.updated
+        core_changed = not unchanged("protos", "icons", *self.__locale_sources())
+        snapshot.icon = icon if core_changed else previous.icon
+
+        if unchanged("protos"):
+            snapshot.raw_protos = previous.raw_protos
+            snapshot.protos = previous.protos
+        else:
+            snapshot.raw_protos = sources["protos"].text
+            snapshot.protos = self.__stage("protos", Protos, snapshot.raw_protos)
+
+        if unchanged("gamemaster") and (previous.raw_gamemaster is not None or "gamemaster" not in sources):
+            snapshot.raw_gamemaster = previous.raw_gamemaster
+            snapshot._gamemaster = previous.__dict__.get("_gamemaster")
+        else:
+            snapshot.raw_gamemaster = self.__stage("gamemaster", sources["gamemaster"].json)
+
+        if unchanged(*self.__locale_sources()):
+            snapshot.locale = previous.locale
+        else:
+            snapshot.locale = self.__stage("locale", self.__make_locale, sources)
+
+        rebuild = []
+        for name in subsystems:
+            if core_changed or self.__changed(name, previous, snapshot, rebuild, unchanged):
+                rebuild.append(name)
+            else:
+                for attribute in (name,) + SUBSYSTEM_ATTRIBUTES.get(name, ()):
+                    setattr(snapshot, attribute, getattr(previous, attribute))
+        if previous is not None:
+            # Indexes check which list they belong to, so the ones of lists taken over stay valid
+            snapshot.indexes = dict(previous.indexes)
+
+        # With `only`, subsystems can depend on ones whose sources weren't downloaded yet
+        missing = {source for name in rebuild for source in SUBSYSTEMS[name][0]} - set(sources)
+        if not icon.repo:
+            missing.discard("icons")
+        fetch_gamemaster = snapshot.raw_gamemaster is None and any(name in SUBSYSTEM_TEMPLATES for name in rebuild)
+        if missing or fetch_gamemaster:
+            sources.update(self.__stage("fetch", self.__fetch_sources, icon, rebuild, fetch_gamemaster))
+            hashes.update((name, _digest(sources[name])) for name in missing)
+            if fetch_gamemaster:
+                snapshot.raw_gamemaster = self.__stage("gamemaster", sources["gamemaster"].json)
+        self.__build_subsystems(self.__builder(snapshot), rebuild, sources)
+        self.__stage("indexes", snapshot.build_indexes)
+        if not self.keep_raw_sources:
+            self.__release_raw(snapshot)
+
+        if self.hook is not None:
+            self.hook("reload", {"seconds": time.perf_counter() - start, "subsystems": rebuild})
+        return snapshot
 
     @staticmethod
-    def __make_locale(url):
-        raw = httpget(url).text
-        keys = re.findall(r"(?<=RESOURCE ID: ).*", raw)
-        values = re.findall(r"(?<=TEXT: ).*", raw)
+    def __changed(name, previous, snapshot, rebuilt, unchanged):
+        """Whether a subsystem has to be rebuilt, or can be taken over from the previous snapshot"""
+        sources, dependencies = SUBSYSTEMS[name]
+        if getattr(previous, name) is None or not unchanged(*sources):
+            return True
+        if any(dependency in rebuilt for dependency in dependencies):
+            return True
+        templates = SUBSYSTEM_TEMPLATES.get(name)
+        if templates is None or unchanged("gamemaster"):
+            return False
+        if previous.raw_gamemaster is None:
+            return True
+        return previous.gamemaster.digest(templates) != snapshot.gamemaster.digest(templates)
+
+    def __make_locale(self, sources):
+        locale = LocaleStore()
+        for language in self.languages:
+            # Remote texts override the ones shipped with the APK
+            for source in ("apk_locale_", "remote_locale_"):
+                locale.add(language, parse_locale(response_lines(sources[source + language])))
+        return locale
+
+    def _require(self, snapshot, *subsystems):
+        """Builds the given subsystems of a snapshot and their dependencies, unless they're built already.
+
+        The data is built on a copy of the snapshot and only added to it once complete, so other
+        threads never see partial lists.
+        """
+        if all(getattr(snapshot, name) is not None for name in subsystems):
+            return
+        with self.__build_lock:
+            missing = [name for name in _resolve_subsystems(subsystems) if getattr(snapshot, name) is None]
+            if not missing:
+                return
+            sources = self.__stage("fetch", self.__fetch_sources, snapshot.icon, missing, False)
+            partial = snapshot.copy()
+            self.__build_subsystems(self.__builder(partial), missing, sources)
+            for name in missing:
+                for attribute in (name,) + SUBSYSTEM_ATTRIBUTES.get(name, ()):
+                    setattr(snapshot, attribute, getattr(partial, attribute))
+            if snapshot.hashes is not None:
+                snapshot.hashes = {**snapshot.hashes, **{name: _digest(source) for name, source in sources.items()}}
+
+    def __built_subsystems(self):
+        # Subsystems that were built on access stay loaded after a reload
+        snapshot = self._snapshot
+        return _resolve_subsystems(
+            self.subsystems + [name for name in SUBSYSTEMS if getattr(snapshot, name, None) is not None]
+        )
+
+    def __swap(self, snapshot):
+        self._snapshot = snapshot
+        self.__next_update = snapshot.updated + timedelta(hours=self.update_interval or 0)
+
+    def __publish(self, previous, snapshot):
+        changes = diff_snapshots(previous, snapshot, SUBSYSTEMS)
+        if changes:
+            for callback in list(self.__subscribers):
+                callback(changes)
+        return changes
+
+    def subscribe(self, callback):
+        """Calls `callback` with the changes of every reload that changed something, see
+        :meth:`reload`. It's called after the new data is swapped in, from the thread that
+        reloaded, which is a background thread for :meth:`refresh`. Returns the callback."""
+        self.__subscribers.append(callback)
+        return callback
 
-        return {keys[i].strip("\r"): values[i].strip("\r") for i in range(len(keys))}
+    def unsubscribe(self, callback):
+        if callback in self.__subscribers:
+            self.__subscribers.remove(callback)
 
-    def reload(self, language=None, icons=None):
+    def reload(self, language=None, icons=None, languages=None, only=None):
         """Reloads all data, as if you'd re-initialize the class.
 
+        All upstream sources are downloaded concurrently before anything is built. If a download
+        fails, :class:`.FetchError` is raised and the current data is kept.
+
+        Every source and the gamemaster entries each subsystem reads are hashed. Only subsystems
+        whose data changed are rebuilt, together with the subsystems depending on them, e.g. a
+        changed move rebuilds moves, mons and everything using mons. Changed protos, locales or
+        icons rebuild everything.
+
         Parameters
         ----------
         language: :class:`str`
             The language used for translations. Default: english
             Available languages: https://github.com/PokeMiners/pogo_assets/tree/master/Texts/Latest%20APK/JSON
+        languages: List[:class:`str`]
+            Additional languages to load, on top of the ones that are already loaded.
+        only: List[:class:`str`]
+            Only download the sources of these subsystems, e.g. `["raids"]`, and keep the protos,
+            gamemaster and locales. Cheap enough to poll often.
+
+        Returns
+        -------
+        A dict mapping every subsystem that changed to a :class:`.Changes` of the objects that
+        were `added`, `removed` or `changed`. Objects are matched by stable keys (e.g. template,
+        form and costume of Pokémon), and only rebuilt subsystems are compared.
+
+        Reloads, background refreshes and subsystems built on access run one at a time, so each
+        one builds on the data the one before swapped in.
         """
-        self.__cached_enums = {}
-        if language:
-            self.__make_locale_url(language)
+        with self.__build_lock:
+            if language or languages:
+                self.__set_languages(language or self.language, languages or [])
+            if icons:
+                self.__iconset = icons
 
-        if icons:
-            self.__iconset = icons
-        self.icon = Icon(icons)
+            previous = self._snapshot
+            snapshot = self.__build(self.__built_subsystems(), previous, only)
+            self.__swap(snapshot)
+            return self.__publish(previous, snapshot)
 
-        self.raw_protos = httpget(PROTO_URL).text
-        self.raw_gamemaster = httpget(GAMEMASTER_URL).json()
+    def __background_reload(self, only=None):
+        with self.__build_lock:
+            previous = self._snapshot
+            try:
+                snapshot = self.__build(self.__built_subsystems(), previous, only)
+            except Exception as e:
+                self.last_error = e
+            else:
+                self.last_error = None
+                self.__swap(snapshot)
+                if self.__subscribers:
+                    self.__publish(previous, snapshot)
 
-        apk_locale = self.__make_locale(self.__locale_url)
-        remote_locale = self.__make_locale(self.__remote_locale_url)
-        self.locale = {**apk_locale, **remote_locale}
+    @property
+    def refreshing(self):
+        """Whether a background refresh is currently running"""
+        thread = self.__refresh_thread
+        return thread is not None and thread.is_alive()
 
-        self.updated = datetime.utcnow()
+    def refresh(self, wait=False, timeout=None, only=None):
+        """Reloads all data in a background thread. Queries keep using the current data until
+        the new data is complete. If a refresh is already running, no new one is started.
 
-        self.types = self.__make_simple_gameobject_list(
-            "HoloPokemonType",
-            "{template}",
-            Type
-        )
-        _make_item_list(self)
-        _make_weather_list(self)
-        _make_move_list(self)
-        _make_mon_list(self)
-        _make_quest_list(self)
-        _make_raid_list(self)
-        _make_grunt_list(self)
-        _make_event_list(self)
+        Parameters
+        ----------
+        wait: :class:`bool`
+            Block until the refresh is done. Default: False
+        timeout: :class:`float`
+            Maximum seconds to wait for.
+        only: List[:class:`str`]
+            Only download the sources of these subsystems, see :meth:`reload`.
+
+        Returns
+        -------
+        :class:`bool` True if no refresh is running anymore.
+        """
+        with self.__refresh_lock:
+            if not self.refreshing:
+                self.__refresh_thread = threading.Thread(
+                    target=self.__background_reload, args=(only,), name="pogodata-refresh", daemon=True
+                )
+                self.__refresh_thread.start()
+        if wait:
+            return self.wait_for_refresh(timeout)
+        return not self.refreshing
+
+    def wait_for_refresh(self, timeout=None):
+        """Blocks until a running background refresh is done.
+
+        Returns
+        -------
+        :class:`bool` True if no refresh is running anymore, False if the timeout passed first.
+        """
+        thread = self.__refresh_thread
+        if thread is not None:
+            thread.join(timeout)
+        return not self.refreshing
 
     def check_update(self):
-        if not self.update_interval:
+        if not self.update_interval or self.__next_update is None:
+            return
+
+        now = datetime.utcnow()
+        if now < self.__next_update:
             return
-        
-        if (datetime.utcnow() - self.updated).seconds // 3600 >= self.update_interval:
+
+        # Until the update succeeds, don't try again on every query
+        self.__next_update = now + timedelta(hours=min(self.update_interval, self.RETRY_INTERVAL))
+        if self.background:
+            self.refresh()
+        else:
             self.reload()
 
     def save(self, path="", name="__pogodata_save__"):
-        with open(f"{path}{name}.pickle", "wb") as handle:
-            pickle.dump(self, handle)
+        """Saves all data to `{path}{name}.snapshot`, to be loaded with :func:`load_pogodata`"""
+        snapshot = self._snapshot
+        config = {
+            "language": self.language,
+            "languages": self.languages[1:],
+            "update_interval": self.update_interval,
+            "icons": snapshot.icon.set.name,
+            "background": self.background,
+            "subsystems": self.subsystems,
+            "raw_mode": self.raw_mode.name,
+            "keep_raw_sources": self.keep_raw_sources
+        }
+        save_snapshot(snapshot, f"{path}{name}.snapshot", config)
+
+    @staticmethod
+    def __release_raw(snapshot):
+        snapshot.raw_protos = None
+        snapshot.raw_gamemaster = None
+        snapshot.__dict__.pop("_gamemaster", None)
+
+    def release_raw(self):
+        """Frees the raw protos and gamemaster of the current data.
+
+        All subsystems that aren't built yet are built first, since they need them. Afterwards,
+        :meth:`get_gamemaster` finds nothing until the next reload.
+        """
+        snapshot = self._snapshot
+        self._require(snapshot, *SUBSYSTEMS)
+        self.__release_raw(snapshot)
+
+    def memory_usage(self):
+        """Returns the approximate memory used by the current data, in bytes.
+
+        Every subsystem is reported as a dict with the size of its `objects` and the `raw`
+        gamemaster entries they keep (see `raw_mode`). Mons also report their `costumes`. The
+        other keys are `icons`, `evolution_graph`, `indexes`, `locale`, `protos`,
+        `raw_protos`, `raw_gamemaster`, `gamemaster_index`, `unloaded_sections` (the data of a
+        saved snapshot that isn't loaded yet) and the `total`.
+
+        Objects referenced from several places are only counted once, for the first key they
+        appear in. The raw sources are counted last, so their numbers are what :meth:`release_raw`
+        would free. Subsystems that aren't built and sections of a saved snapshot that aren't
+        loaded yet are left out.
+        """
+        snapshot = self._snapshot
+        loaded = snapshot.__dict__
+        seen = set()
+        usage = {"icons": deep_size(snapshot.icon, seen)}
+
+        for name in SUBSYSTEMS:
+            objs = loaded.get(name)
+            if objs is None:
+                continue
+            subsystem = usage[name] = {"raw": sum(deep_size(owned_raw(obj), seen) for obj in objs)}
+            if name == "mons":
+                subsystem["costumes"] = sum(deep_size(mon, seen) for mon in objs if mon.type == PokemonType.COSTUME)
+            subsystem["objects"] = deep_size(objs, seen)
+
+        for name in ("evolution_graph", "indexes", "locale", "protos", "raw_protos", "raw_gamemaster"):
+            usage[name] = deep_size(loaded.get(name), seen)
+        usage["gamemaster_index"] = deep_size(loaded.get("_gamemaster"), seen)
+        usage["unloaded_sections"] = deep_size(loaded.get("_loader"), seen)
+
+        usage["total"] = sum(
+            sum(value.values()) if isinstance(value, dict) else value for value in usage.values()
+        )
+        return usage
 
     def __make_simple_gameobject_list(self, enum, locale_key, obj):
         objs = []
         for template, id_ in self.get_enum(enum).items():
             obj_ = obj(self.icon, id_, template)
-            obj_.name = self.get_locale(locale_key.format(template=template))
+            obj_.locale_key = locale_key.format(template=template)
+            obj_.name = self.get_locale(obj_.locale_key)
             objs.append(obj_)
         return objs
 
-    def __get_object(self, obj_list, args, match_all=False):
+    def __get_object(self, name, args, match_all=False):
+        self.check_update()
+
+        snapshot = self._snapshot
+        self._require(snapshot, name)
+        if self.hook is None:
+            return self.__find(snapshot, name, args, match_all)
+
+        start = time.perf_counter()
+        result = self.__find(snapshot, name, args, match_all)
+        seconds = time.perf_counter() - start
+
+        obj_list = getattr(snapshot, name)
+        positions = snapshot.index(name).candidates(args) if isinstance(obj_list, list) else None
+        if match_all:
+            found = len(result)
+        else:
+            found = 0 if result is None else 1
+        self.hook("query", {
+            "name": name,
+            "args": tuple(args),
+            "scanned": len(obj_list) if positions is None else len(positions),
+            "found": found,
+            "seconds": seconds
+        })
+        return result
+
+    def __iter_objects(self, name, args, where, limit):
+        """Returns an iterator over the objects of a list that match args and `where`, until
+        `limit` are found. Updates and builds on access happen right away, not on the first `next()`"""
         self.check_update()
+        if limit is not None and limit <= 0:
+            return iter(())
+
+        snapshot = self._snapshot
+        self._require(snapshot, name)
+        obj_list = getattr(snapshot, name)
+        positions = snapshot.index(name).candidates(args) if isinstance(obj_list, list) else None
+        objs = obj_list if positions is None else (obj_list[p] for p in positions)
+        return self.__matching(name, args, objs, where, limit)
+
+    def __matching(self, name, args, objs, where, limit):
+        hook = self.hook
+        start = None if hook is None else time.perf_counter()
+        scanned = 0
+        found = 0
+        try:
+            for obj in objs:
+                scanned += 1
+                if matches(obj, args) and (where is None or where(obj)):
+                    found += 1
+                    yield obj
+                    if found == limit:
+                        return
+        finally:
+            if hook is not None:
+                hook("query", {
+                    "name": name,
+                    "args": tuple(args),
+                    "scanned": scanned,
+                    "found": found,
+                    "seconds": time.perf_counter() - start
+                })
+
+    @staticmethod
+    def __find(snapshot, name, args, match_all):
+        obj_list = getattr(snapshot, name)
+        if isinstance(obj_list, list):
+            return snapshot.index(name).find(args, match_all)
 
         final = []
         for obj in obj_list:
-            wanted = True
-            for key, value in args.items():
-                big_value = obj.__dict__.get(key)
-
-                if isinstance(big_value, list):
-                    if not set(value).issubset(set(big_value)):
-                        wanted = False
-                elif isinstance(big_value, Enum):
-                    if not ((big_value.value == value) or (big_value.name == value) or (big_value == value)):
-                        wanted = False
-                elif big_value != value:
-                    wanted = False
-
-            if wanted:
+            if matches(obj, args):
                 if not match_all:
                     return obj
                 final.append(obj)
@@ -182,7 +796,7 @@ class PogoData:
         Returns
         -------
         """
-        mon = self.__get_object(self.mons, args, get_all)
+        mon = self.__get_object("mons", args, get_all)
 
         if not mon:
             mon = self.__none_mon()
@@ -191,6 +805,87 @@ class PogoData:
 
         return mon
 
+    def get_mons(self, keys, indices=False):
+        """Finds the Pokémon for many keys at once, e.g. a batch of encounters.
+
+        Parameters
+        ----------
+        keys:
+            Tuples of `(id, form, costume, temp_evolution)`, where values can be left out or None
+            to match any, or dicts of those attributes. Each is resolved like
+            `get_mon(id=..., form=..., ...)`. Dicts with other parameters are passed to :meth:`get_mon`.
+            Can also be an integer numpy array of shape (n, 1 to 4), with -1 matching any value.
+        indices: :class:`bool`
+            Return the positions of the Pokémon in `mons` instead, -1 if there is none.
+
+        Returns
+        -------
+        A list of :class:`.Pokemon`, with the same unset Pokémon :meth:`get_mon` returns for keys
+        without a match. For a numpy array and `indices=True`, an array of positions.
+        """
+        self.check_update()
+        snapshot = self._snapshot
+        self._require(snapshot, "mons")
+        if self.hook is None:
+            positions = self.__positions(snapshot, keys)
+        else:
+            start = time.perf_counter()
+            positions = self.__positions(snapshot, keys)
+            seconds = time.perf_counter() - start
+            if is_array(positions):
+                found = int((positions != -1).sum())
+            else:
+                found = len(positions) - positions.count(-1)
+            self.hook("query", {
+                "name": "mons",
+                "args": ("keys",),
+                "scanned": len(positions),
+                "found": found,
+                "seconds": seconds
+            })
+        if indices:
+            return positions
+
+        mons = snapshot.mons
+        return [self.__none_mon() if position == -1 else mons[position] for position in positions]
+
+    def __positions(self, snapshot, keys):
+        table = snapshot.mon_table()
+        if is_array(keys):
+            return table.positions(keys)
+
+        keys = list(keys)
+        positions = table.positions(keys)
+        for i, position in enumerate(positions):
+            if position is None:
+                # Keys with names or other parameters go the way of get_mon
+                positions[i] = self.__position(snapshot, key_args(keys[i]))
+        return positions
+
+    def __position(self, snapshot, args):
+        mon = self.__find(snapshot, "mons", args, False)
+        if mon:
+            for position, obj in enumerate(snapshot.mons):
+                if obj is mon:
+                    return position
+        return -1
+
+    def iter_mons(self, where=None, limit=None, **args):
+        """Yields the Pokémon matching every parameter given, in list order, as they're found.
+
+        Takes the same parameters as :meth:`get_mon`. Any of them can also be a :class:`.Range`,
+        e.g. `attack=Range(250)`.
+
+        Parameters
+        ----------
+        where:
+            A function that's called with every Pokémon matching the parameters. Only those it
+            returns True for are yielded.
+        limit: :class:`int`
+            Stop after this many Pokémon.
+        """
+        return self.__iter_objects("mons", args, where, limit)
+
     def get_default_mon(self, **args):
         mons = self.get_mon(get_all=True, **args)
         if not mons:
@@ -203,8 +898,19 @@ class PogoData:
     def get_all_mons(self, **args):
         return self.get_mon(get_all=True, **args)
 
+    def get_family(self, **args):
+        """Returns all Pokémon in the family of the first Pokémon matching the given parameters,
+        including forms, costumes and Mega Evolutions. Takes the same parameters as :meth:`get_mon`"""
+        mon = self.get_mon(**args)
+        return list(self.evolution_graph.family(mon))
+
+    def get_pre_evolution(self, **args):
+        """Returns the Pokémon the first Pokémon matching the given parameters evolves from, or None"""
+        mon = self.get_mon(**args)
+        return self.evolution_graph.pre_evolution(mon)
+
     def get_raid(self, get_all=False, **args):
-        raid = self.__get_object(self.raids, args, get_all)
+        raid = self.__get_object("raids", args, get_all)
         if not raid:
             raid = self.__none_mon()
             raid.level = 0
@@ -213,8 +919,12 @@ class PogoData:
     def get_all_raids(self, **args):
         return self.get_raid(get_all=True, **args)
 
+    def iter_raids(self, where=None, limit=None, **args):
+        """Like :meth:`iter_mons`, for raids"""
+        return self.__iter_objects("raids", args, where, limit)
+
     def get_quest(self, get_all=False, **args):
-        quest = self.__get_object(self.quests, args, get_all)
+        quest = self.__get_object("quests", args, get_all)
         if not quest:
             quest = Quest()
         return quest
@@ -222,18 +932,26 @@ class PogoData:
     def get_all_quests(self, **args):
         return self.get_quest(get_all=True, **args)
 
+    def iter_quests(self, where=None, limit=None, **args):
+        """Like :meth:`iter_mons`, for quests"""
+        return self.__iter_objects("quests", args, where, limit)
+
     def get_type(self, **args):
         if "template" in args:
             if not args["template"].startswith("POKEMON_TYPE_"):
                 args["template"] = "POKEMON_TYPE_" + args["template"]
 
-        type_ = self.__get_object(self.types, args)
+        type_ = self.__get_object("types", args)
         if not type_:
             type_ = Type(self.icon, 0, "UNSET")
         return type_
 
+    def iter_types(self, where=None, limit=None, **args):
+        """Like :meth:`iter_mons`, for types"""
+        return self.__iter_objects("types", args, where, limit)
+
     def get_item(self, get_all=False, **args):
-        item = self.__get_object(self.items, args, get_all)
+        item = self.__get_object("items", args, get_all)
         if not item:
             item = Item(self.icon, 0, "UNSET", {})
         return item
@@ -241,65 +959,115 @@ class PogoData:
     def get_all_items(self, **args):
         return self.get_item(get_all=True, **args)
 
+    def iter_items(self, where=None, limit=None, **args):
+        """Like :meth:`iter_mons`, for items"""
+        return self.__iter_objects("items", args, where, limit)
+
     def get_move(self, **args):
-        move = self.__get_object(self.moves, args)
+        move = self.__get_object("moves", args)
         if not move:
             move = Move("UNSET", {}, 0)
         return move
 
+    def iter_moves(self, where=None, limit=None, **args):
+        """Like :meth:`iter_mons`, for moves"""
+        return self.__iter_objects("moves", args, where, limit)
+
     def get_weather(self, **args):
-        weather = self.__get_object(self.weather, args)
+        weather = self.__get_object("weather", args)
         if not weather:
             weather = Weather(self.icon, "UNSET", {}, 0)
         return weather
 
+    def iter_weather(self, where=None, limit=None, **args):
+        """Like :meth:`iter_mons`, for weather"""
+        return self.__iter_objects("weather", args, where, limit)
+
     def get_grunt(self, **args):
-        grunt = self.__get_object(self.grunts, args)
+        grunt = self.__get_object("grunts", args)
         if not grunt:
             grunt = Grunt(self.icon, 0, "UNSET", {}, {}, [])
         return grunt
 
+    def iter_grunts(self, where=None, limit=None, **args):
+        """Like :meth:`iter_mons`, for grunts"""
+        return self.__iter_objects("grunts", args, where, limit)
+
     def get_event(self, **args):
-        event = self.__get_object(self.events, args)
+        event = self.__get_object("events", args)
         if not event:
             event = Event({})
         return event
 
-    def get_locale(self, key):
-        self.check_update()
-        return self.locale.get(key.lower(), "?")
+    def iter_events(self, where=None, limit=None, **args):
+        """Like :meth:`iter_mons`, for events"""
+        return self.__iter_objects("events", args, where, limit)
 
-    def get_enum(self, enum, message=None, reverse=False, as_enum=False):
+    def __event_index(self):
         self.check_update()
-        cache_key = str(message).lower() + ":" + enum.lower()
-        cached = self.__cached_enums.get(cache_key)
-        if cached:
-            final = cached
-        else:
-            if message is not None:
-                protos = re.findall(f"message {message}" + r"[^ß]*?message", self.raw_protos, re.IGNORECASE)
-                # sorry
+        snapshot = self._snapshot
+        self._require(snapshot, "events")
+        return snapshot.event_index()
 
-                if len(protos) == 0:
-                    return
-                protos = protos[0]
-            else:
-                protos = self.raw_protos
+    def get_active_events(self, time=None, bonus=None):
+        """Returns the events active at `time`.
 
-            proto = re.findall(f"enum {enum} "+r"{[^}]*}", protos, re.IGNORECASE)
-            if len(proto) == 0:
-                return
+        Parameters
+        ----------
+        time: :class:`datetime`
+            In local time, like the event times. Default: now
+        bonus:
+            Only return events with this :class:`.EventBonusType`, or one of a list of them.
+            Also takes their names or values, e.g. `STARDUST` or `increased-stardust`.
+        """
+        return self.__event_index().active(time or datetime.now(), bonus)
+
+    def get_events_between(self, start, end, bonus=None):
+        """Returns the events active at any time from `start` up to `end`. See :meth:`get_active_events`"""
+        return self.__event_index().between(start, end, bonus)
 
-            proto = proto[0].replace("\t", "")
+    def get_active_bonuses(self, time=None, bonus=None):
+        """Returns the :class:`.EventBonus` of all events active at `time`. See :meth:`get_active_events`"""
+        return self.__event_index().bonuses(time or datetime.now(), bonus)
 
-            final = {}
-            proto = proto.split("{\n")[1].split("\n}")[0]
-            for entry in proto.split("\n"):
-                k = entry.split(" =")[0]
-                v = int(entry.split("= ")[1].split(";")[0])
-                final[k] = v
+    def get_active_mons(self, time=None):
+        """Returns the spawns, eggs, raids and shinies of all events active at `time` as an
+        :class:`.ActiveMons` of Pokémon sets. They're computed once and reused until an event
+        starts or ends."""
+        return self.__event_index().mons(time or datetime.now())
 
-            self.__cached_enums[cache_key] = final
+    def get_locale(self, key, language=None):
+        """Returns the translation of `key`, or "?" if there is none.
+
+        `language` must be the main language or one of `languages`. Default: the main language
+        """
+        self.check_update()
+        return self.locales.get(key.lower(), language or self.language, "?")
+
+    def get_name(self, obj, language=None):
+        """Returns the name of an object (e.g. a :class:`.Pokemon`) in another language.
+        Names that don't come from the in-game texts, like event names, are returned as they are"""
+        if getattr(obj, "locale_key", None) is None:
+            return obj.name
+        return self.get_locale(obj.locale_key, language)
+
+    def get_enum(self, enum, message=None, reverse=False, as_enum=False):
+        self.check_update()
+        if self.hook is None:
+            return self.__get_enum(enum, message, reverse, as_enum)
+
+        start = time.perf_counter()
+        result = self.__get_enum(enum, message, reverse, as_enum)
+        values = 0
+        if result is not None:
+            values = len(result)
+        self.hook("enum", {"enum": enum, "values": values, "seconds": time.perf_counter() - start})
+        return result
+
+    def __get_enum(self, enum, message, reverse, as_enum):
+        final = self.protos.enum(enum, message)
+        if final is None:
+            return
 
         if as_enum:
             return Enum(enum, final)
@@ -310,16 +1078,39 @@ class PogoData:
         return final
 
     def get_gamemaster(self, pattern, settings=None):
+        """Returns a list of (templateId, data) tuples of all gamemaster entries whose templateId
+        matches the regex `pattern`. If `settings` is given, only that part of the data is returned.
+
+        Patterns anchored to a template family (e.g. `^V\\d{4}_POKEMON_`) are answered from an index
+        of that family, with the same results as a full search.
+        """
         self.check_update()
+        if self.hook is None:
+            return self.__get_gamemaster(pattern, settings)
+
+        start = time.perf_counter()
+        result = self.__get_gamemaster(pattern, settings)
+        self.hook("gamemaster", {"pattern": pattern, "found": len(result), "seconds": time.perf_counter() - start})
+        return result
+
+    def __get_gamemaster(self, pattern, settings):
         result = []
-        for entry in self.raw_gamemaster:
-            templateid = entry.get("templateId", "")
-            if re.search(pattern, templateid):
-                data = entry.get("data", {})
-                if settings:
-                    data = data.get(settings, {})
-
-                result.append((
-                    templateid, data
-                ))
+        for entry in self._snapshot.gamemaster.search(pattern):
+            data = entry.get("data", {})
+            if settings:
+                data = data.get(settings, {})
+            result.append((
+                entry.get("templateId", ""), data
+            ))
         return result
+
+    def get_gamemaster_entry(self, template_id, settings=None):
+        """Returns the data of the gamemaster entry with exactly this templateId, or None"""
+        self.check_update()
+        entry = self._snapshot.gamemaster.get(template_id)
+        if entry is None:
+            return None
+        data = entry.get("data", {})
+        if settings:
+            data = data.get(settings, {})
+        return data
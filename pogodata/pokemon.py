@@ -1,8 +1,12 @@
 import re
+import sys
 from math import floor
 from enum import Enum
 from .objects import GameMasterObject
-from .misc import httpget, INGAME_ICONS, ICON_SHA, CP_MULTIPLIERS, get_repo_content
+from .misc import CP_MULTIPLIERS
+from .evolution import EvolutionGraph
+
+_COSTUME_ICON = re.compile(r"Images/Pokemon/(pokemon_icon_\d*_\d*)_(\d+)(?!\d*_?shiny).png")
 
 
 class PokemonType(Enum):
@@ -14,18 +18,29 @@ class PokemonType(Enum):
 
 
 class Pokemon(GameMasterObject):
+    __slots__ = (
+        "form", "costume", "base_template", "quick_moves", "charge_moves", "elite_quick_moves",
+        "elite_charge_moves", "types", "evolutions", "temp_evolutions", "stats", "asset_value", "asset_suffix",
+        "asset", "temp_evolution", "temp_evolution_id", "deployable", "transferable", "tradable", "type",
+        "level", "amount", "reward_type", "family", "__icon"
+    )
+
     def __init__(self, icon, gamemaster_entry, form_id, template):
         super().__init__(0, template, gamemaster_entry)
 
         self.form = form_id
         self.costume = None
-        self.base_template = self.raw.get("pokemonId", "")
-
-        self.quick_moves = []
-        self.charge_moves = []
-        self.types = []
-        self.evolutions = []
-        self.temp_evolutions = []
+        self.base_template = sys.intern(self.raw.get("pokemonId", ""))
+        family = self.raw.get("familyId")
+        self.family = sys.intern(family) if family else None
+
+        self.quick_moves = ()
+        self.charge_moves = ()
+        self.elite_quick_moves = ()
+        self.elite_charge_moves = ()
+        self.types = ()
+        self.evolutions = ()
+        self.temp_evolutions = ()
         self.make_stats()
 
         self.asset_value = None
@@ -47,16 +62,31 @@ class Pokemon(GameMasterObject):
         self.__icon = icon
 
     def cp(self, level, ivs):
-        multiplier = CP_MULTIPLIERS.get(level, 0.5)
+        # Accepts the same levels as pogodata.cp.level_index, without needing numpy
+        multiplier = CP_MULTIPLIERS.get(level)
+        if multiplier is None:
+            raise ValueError(f"Unknown level {level}")
         attack = self.stats[0] + ivs[0]
         defense = self.stats[1] + ivs[1]
         stamina = self.stats[2] + ivs[2]
-        return floor((attack * defense**0.5 * stamina**0.5 * multiplier**2) / 10)
+        return max(floor((attack * defense**0.5 * stamina**0.5 * multiplier**2) / 10), 10)
 
     @property
     def moves(self):
         return self.quick_moves + self.charge_moves
 
+    @property
+    def attack(self):
+        return self.stats[0] if self.stats else None
+
+    @property
+    def defense(self):
+        return self.stats[1] if self.stats else None
+
+    @property
+    def stamina(self):
+        return self.stats[2] if self.stats else None
+
     @property
     def icon_url(self):
         return self.__icon.pokemon(self)
@@ -77,17 +107,18 @@ class Pokemon(GameMasterObject):
     def make_stats(self):
         stats = self.raw.get("stats")
         if not stats:
-            self.stats = []
+            self.stats = ()
             return
-        self.stats = [stats["baseAttack"], stats["baseDefense"], stats["baseStamina"]]
+        self.stats = (stats["baseAttack"], stats["baseDefense"], stats["baseStamina"])
 
 
-def _make_mon_list(pogodata):
+def _make_mon_list(pogodata, icons):
     def __typing(mon, type1ref, type2ref):
         typings = [mon.raw.get(type1ref), mon.raw.get(type2ref)]
-        for typing in typings:
-            if typing:
-                mon.types.append(pogodata.get_type(template=typing))
+        mon.types = tuple(pogodata.get_type(template=typing) for typing in typings if typing)
+
+    def __moves(mon, key):
+        return tuple(pogodata.get_move(template=t) for t in mon.raw.get(key, []))
 
     pogodata.mons = []
     forms = pogodata.get_enum("Form")
@@ -111,36 +142,44 @@ def _make_mon_list(pogodata):
         mon.gen_asset()
 
         locale_key = "pokemon_name_" + str(mon.id).zfill(4)
+        mon.locale_key = locale_key
         mon.name = pogodata.get_locale(locale_key)
 
-        mon.quick_moves = [pogodata.get_move(template=t) for t in mon.raw.get("quickMoves", [])]
-        mon.charge_moves = [pogodata.get_move(template=t) for t in mon.raw.get("cinematicMoves", [])]
+        mon.quick_moves = __moves(mon, "quickMoves")
+        mon.charge_moves = __moves(mon, "cinematicMoves")
         
-        mon.elite_charge_moves = [pogodata.get_move(template=t) for t in mon.raw.get("eliteCinematicMove", [])]
-        mon.elite_quick_moves = [pogodata.get_move(template=t) for t in mon.raw.get("eliteCinematicMove", [])]
+        mon.elite_charge_moves = __moves(mon, "eliteCinematicMove")
+        mon.elite_quick_moves = __moves(mon, "eliteCinematicMove")
 
         __typing(mon, "type", "type2")
 
         pogodata.mons.append(mon)
 
         # Handling Temp (Mega) Evolutions
+        temp_evolutions = []
         for temp_evo in mon.raw.get("tempEvoOverrides", []):
             evo = mon.copy()
             evo.type = PokemonType.TEMP_EVOLUTION
+            # The forms below change the assets of the base, which the variant keeps as they are now
+            evo.asset_value = mon.asset_value
+            evo.asset_suffix = mon.asset_suffix
+            evo.asset = mon.asset
 
             temp_evolution = temp_evo.get("tempEvoId")
             evo.temp_evolution = megas[temp_evolution]
             evo.temp_evolution_id = evo.temp_evolution.value
 
             evo.raw = temp_evo
-            evo.name = pogodata.get_locale(locale_key + "_" + str(evo.temp_evolution.value).zfill(4))
+            evo.temp_evolutions = ()
+            evo.locale_key = locale_key + "_" + str(evo.temp_evolution.value).zfill(4)
+            evo.name = pogodata.get_locale(evo.locale_key)
             evo.make_stats()
 
-            evo.types = []
             __typing(evo, "typeOverride1", "typeOverride2")
 
             pogodata.mons.append(evo)
-            mon.temp_evolutions.append(evo)
+            temp_evolutions.append(evo)
+        mon.temp_evolutions = tuple(temp_evolutions)
 
     # Going through GM Forms and adding missing Forms (Unown, Spinda) and making in-game assets
     form_enums = pogodata.get_enum("Form")
@@ -150,8 +189,11 @@ def _make_mon_list(pogodata):
             mon = pogodata.get_mon(template=form.get("form"))
             if not mon:
                 mon = pogodata.get_mon(template=formsettings["pokemon"])
-                mon = mon.copy()
+                base = mon
+                mon = base.copy()
                 mon.type = PokemonType.FORM
+                mon.asset_value = base.asset_value
+                mon.asset_suffix = base.asset_suffix
                 mon.template = form.get("form")
                 mon.form = form_enums.get(mon.template)
                 pogodata.mons.append(mon)
@@ -181,40 +223,42 @@ def _make_mon_list(pogodata):
                 mon.asset_value = temp_evo_raw["assetBundleValue"]
                 mon.gen_asset()
 
-    # Making Pokemon.evolutions attributes
-    def append_evolution(mon, to_append):
-        evolutions = mon.raw.get("evolutionBranch", [])
-        for evo_raw in evolutions:
-            if "temporaryEvolution" in evo_raw:
-                continue
-            evo = pogodata.get_mon(
-                template=evo_raw.get("form", evo_raw["evolution"])
-            )
-            to_append.append(evo)
-            append_evolution(evo, to_append)
+    # Costumes
+    pogodata.mons.extend(_make_costume_list(pogodata.mons, icons, costumes))
+
+    # Evolutions and families. Costumes share them with the mon they're a variant of
+    graph = EvolutionGraph(pogodata.mons)
     for mon in pogodata.mons:
-        evos = []
-        append_evolution(mon, evos)
-        mon.evolutions = evos
+        if mon.type != PokemonType.COSTUME:
+            mon.evolutions = graph.evolutions(mon)
+    pogodata.evolution_graph = graph
 
-    # Costumes
+def _make_costume_list(mons, icons, costumes):
+    """Makes a costume variant for every costume icon in the PokeMiners assets.
 
-    icons = get_repo_content(INGAME_ICONS, ICON_SHA)
+    The icon names are joined against the assets of `mons` in a single pass. Icons without a
+    matching mon are skipped.
+    """
+    assets = {}
+    for mon in mons:
+        assets.setdefault(mon.asset, mon)
 
+    variants = []
     for icon in icons:
-        match = re.match(r"Images/Pokemon/pokemon_icon(_\d*){3}(?!\d*_?shiny).png", icon)
-        if match:
-            icon = icon.replace(".png", "")
-            icon = icon.replace("Images/Pokemon/", "")
-
-            costume = re.findall(r"_\d*$", icon)[0]
-            og_asset = re.sub(costume + "$", "", icon)
-            og_asset = re.sub(r"_01$", "_00", og_asset)
-            costume = int(costume.strip("_"))
-
-            mon = pogodata.get_mon(asset=og_asset)
-            copy = mon.copy()
-            copy.costume = costumes(costume)
-            copy.gen_asset()
-            copy.type = PokemonType.COSTUME
-            pogodata.mons.append(copy)
+        match = _COSTUME_ICON.match(icon)
+        if not match:
+            continue
+
+        og_asset, costume = match.groups()
+        if og_asset.endswith("_01"):
+            og_asset = og_asset[:-3] + "_00"
+        mon = assets.get(og_asset)
+        if mon is None:
+            continue
+
+        variant = mon.copy()
+        variant.costume = costumes(int(costume))
+        variant.gen_asset()
+        variant.type = PokemonType.COSTUME
+        variants.append(variant)
+    return variants
@@ -0,0 +1,83 @@
+import re
+
+_TOKENS = re.compile(r"""
+    //[^\n]*
+  | /\*.*?\*/
+  | "(?:[^"\\\n]|\\.)*"
+  | \b(message|enum|oneof|service|extend)\s+([\w.]+)\s*\{
+  | (\{)
+  | (\})
+  | \b([A-Za-z_]\w*)\s*=\s*(-?(?:0[xX][0-9a-fA-F]+|\d+))
+""", re.VERBOSE | re.DOTALL)
+
+
+class ProtoMessage:
+    """A message (or the file itself) with the enums and messages declared directly in it.
+
+    Enum values are plain dicts mapping a template to its ID.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.enums = {}
+        self.messages = {}
+
+    def __str__(self):
+        return self.name
+
+
+class Protos:
+    """A structured model of a .proto file, parsed in a single pass.
+
+    Lookups are case insensitive. Without a message, the first enum with that name anywhere
+    in the file is used, including enums nested in messages.
+    """
+    def __init__(self, raw_protos):
+        self.root = ProtoMessage("")
+        self.__enums = {}
+        self.__messages = {}
+        self.__parse(raw_protos)
+
+    def __parse(self, raw_protos):
+        # Every open brace pushes its block; only messages and enums are kept
+        stack = [self.root]
+        for match in _TOKENS.finditer(raw_protos):
+            kind, name, open_brace, close_brace, key, value = match.groups()
+            if kind:
+                parent = stack[-1]
+                if kind == "enum":
+                    block = {}
+                    if isinstance(parent, ProtoMessage):
+                        parent.enums.setdefault(name, block)
+                    self.__enums.setdefault(name.lower(), block)
+                elif kind == "message":
+                    block = ProtoMessage(name)
+                    if isinstance(parent, ProtoMessage):
+                        parent.messages.setdefault(name, block)
+                    self.__messages.setdefault(name.lower(), block)
+                else:
+                    block = None
+                stack.append(block)
+            elif open_brace:
+                stack.append(None)
+            elif close_brace:
+                if len(stack) > 1:
+                    stack.pop()
+            elif key and isinstance(stack[-1], dict):
+                stack[-1][key] = int(value, 16) if "x" in value.lower() else int(value)
+
+    def message(self, name):
+        return self.__messages.get(name.lower())
+
+    def enum(self, name, message=None):
+        """Returns the values of an enum as a dict, or None if it doesn't exist"""
+        if message is None:
+            return self.__enums.get(name.lower())
+
+        message = self.message(message)
+        if message is None:
+            return None
+        name = name.lower()
+        for enum_name, values in message.enums.items():
+            if enum_name.lower() == name:
+                return values
+        return None
@@ -0,0 +1,166 @@
+"""PvP rank tables for all IV combinations. Requires numpy (`pip install pogodata[cp]`)"""
+import os
+import hashlib
+from enum import Enum
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from .cp import np, _require_numpy, _cp, _hp, level_index, LEVELS, MULTIPLIERS, IVS
+
+Rank = namedtuple("Rank", ["rank", "level", "cp", "stat_product"])
+
+CACHE_VERSION = 2
+
+
+class League(Enum):
+    LITTLE = 500
+    GREAT = 1500
+    ULTRA = 2500
+
+
+def _league(league):
+    if isinstance(league, League):
+        return league
+    if isinstance(league, str):
+        return League[league.upper()]
+    return League(league)
+
+
+def rank_table(stats, cap, max_level=50):
+    """Ranks all 4096 IV combinations of one Pokémon for a CP cap.
+
+    Every IV combination gets the highest level up to `max_level` that stays under the cap,
+    and is ranked by its stat product (attack * defense * HP at that level). Equal stat products
+    share a rank. IV combinations over the cap even at level 1 can't enter the league; they get
+    rank 0 and a stat product of 0, and aren't counted in the ranks of the others.
+
+    Returns
+    -------
+    A tuple of arrays indexed like :data:`.cp.IVS`: rank, level index, CP and stat product.
+    """
+    stats = np.asarray(stats, dtype=np.float64)
+    multipliers = MULTIPLIERS[:level_index(max_level) + 1]
+    total = stats.reshape(1, 1, 3) + IVS.reshape(1, -1, 3)
+    multipliers_ = multipliers.reshape(-1, 1)
+
+    # CP only grows with level, so the best level is the last one under the cap
+    cps = _cp(total, multipliers_)
+    under_cap = (cps <= cap).sum(axis=0)
+    eligible = under_cap > 0
+    levels = np.maximum(under_cap - 1, 0)
+    cp = cps[levels, np.arange(len(IVS))]
+
+    multiplier = multipliers[levels]
+    hp = _hp(total[0], multiplier)
+    stat_product = np.where(eligible, total[0, :, 0] * multiplier * total[0, :, 1] * multiplier * hp, 0)
+
+    descending = -np.sort(stat_product[eligible])[::-1]
+    rank = np.where(eligible, np.searchsorted(descending, -stat_product, side="left") + 1, 0)
+    return rank, levels, cp, stat_product
+
+
+def _rank_tables(stats, max_level):
+    tables = [rank_table(stats, league.value, max_level) for league in League]
+    return [np.stack(column) for column in zip(*tables)]
+
+
+class PvpRanks:
+    """Rank tables of all IV combinations for Little, Great and Ultra League.
+
+    Tables are computed once per distinct set of base stats, so forms and costumes sharing
+    stats share a table.
+
+    Parameters
+    ----------
+    mons: List[:class:`.Pokemon`]
+        The Pokémon to rank, e.g. :attr:`.PogoData.mons`. Pokémon without stats are skipped.
+    max_level: :class:`float`
+        The highest level a Pokémon can be powered up to. Default: 50
+    processes: :class:`int`
+        Number of worker processes to compute tables in. 0 computes everything in this process.
+        Default: one per CPU
+    cache_dir: :class:`str`
+        A directory to keep computed tables in. The cache file is keyed on the base stats of all
+        Pokémon, so it's reused until a gamemaster update changes them.
+    """
+    def __init__(self, mons, max_level=50, processes=None, cache_dir=None):
+        _require_numpy()
+        self.max_level = max_level
+
+        stats = sorted({tuple(mon.stats) for mon in mons if mon.stats})
+        self.__rows = {stats_: i for i, stats_ in enumerate(stats)}
+
+        filename = None
+        if cache_dir:
+            key = hashlib.sha1(repr((CACHE_VERSION, max_level, stats)).encode("utf-8")).hexdigest()
+            filename = os.path.join(cache_dir, f"pvp_{key}.npz")
+            if os.path.exists(filename):
+                with np.load(filename) as cache:
+                    self.__set(cache["rank"], cache["level"], cache["cp"], cache["stat_product"])
+                return
+
+        self.__set(*self.__compute(stats, processes))
+        if filename:
+            os.makedirs(cache_dir, exist_ok=True)
+            temp = f"{filename}.{os.getpid()}.tmp.npz"
+            np.savez(temp, rank=self.rank, level=self.level, cp=self.cp, stat_product=self.stat_product)
+            os.replace(temp, filename)
+
+    def __set(self, rank, level, cp, stat_product):
+        # Shape (stats, league, IVs) each
+        self.rank = rank
+        self.level = level
+        self.cp = cp
+        self.stat_product = stat_product
+
+    def __compute(self, stats, processes):
+        if processes == 0 or len(stats) < 2:
+            tables = [_rank_tables(stats_, self.max_level) for stats_ in stats]
+        else:
+            with ProcessPoolExecutor(processes) as pool:
+                tables = list(pool.map(
+                    _rank_tables, stats, [self.max_level] * len(stats), chunksize=16
+                ))
+
+        if not tables:
+            empty = np.zeros((0, len(League), len(IVS)))
+            return empty.astype(np.int16), empty.astype(np.uint8), empty.astype(np.int16), empty.astype(np.float32)
+        rank, level, cp, stat_product = (np.stack(column) for column in zip(*tables))
+        return rank.astype(np.int16), level.astype(np.uint8), cp.astype(np.int16), stat_product.astype(np.float32)
+
+    def __position(self, mon, league):
+        row = self.__rows.get(tuple(getattr(mon, "stats", mon)))
+        return row, list(League).index(_league(league))
+
+    def get(self, mon, ivs, league):
+        """Returns the :class:`Rank` of a Pokémon with the given (attack, defense, stamina) IVs in a
+        league, or None if there's no table for its stats. IVs that are over the cap even at
+        level 1 get a :class:`Rank` of only None.
+
+        `mon` can be a :class:`.Pokemon` or its base stats. `league` is a :class:`League`,
+        its name or its CP cap. Raises ValueError for IVs outside of 0 to 15.
+        """
+        if len(ivs) != 3 or not all(isinstance(iv, (int, np.integer)) and 0 <= iv <= 15 for iv in ivs):
+            raise ValueError(f"IVs must be three whole numbers from 0 to 15, not {ivs}")
+        row, league = self.__position(mon, league)
+        if row is None:
+            return None
+        iv = ivs[0] * 256 + ivs[1] * 16 + ivs[2]
+        if not self.rank[row, league, iv]:
+            return Rank(None, None, None, None)
+        return Rank(
+            int(self.rank[row, league, iv]),
+            float(LEVELS[self.level[row, league, iv]]),
+            int(self.cp[row, league, iv]),
+            float(self.stat_product[row, league, iv])
+        )
+
+    def table(self, mon, league):
+        """Returns the (rank, level, cp, stat product) arrays of a Pokémon for a league, indexed
+        like :data:`.cp.IVS`, or None if there's no table for its stats. A rank of 0 marks IVs
+        over the cap even at level 1, see :func:`rank_table`"""
+        row, league = self.__position(mon, league)
+        if row is None:
+            return None
+        return self.rank[row, league], LEVELS[self.level[row, league]], self.cp[row, league], \
+            self.stat_product[row, league]
@@ -1,6 +1,6 @@
 from enum import Enum
 
-from .misc import httpget, INFO_URL, match_enum
+from .misc import match_enum
 
 
 class QuestType(Enum):
@@ -47,10 +47,11 @@ class Quest:
         return bool(self.type.value)
 
 
-def _make_quest_list(pogodata):
-    info_quests = httpget(INFO_URL + "active/quests.json").json()
+def _make_quest_list(pogodata, info_quests):
     reward_types = pogodata.get_enum("Type", message="QuestRewardProto", as_enum=True)
     pogodata.quests = []
+    # Pokémon rewards are resolved in one batch once all quests are read
+    mon_rewards = []
 
     for quest_type, quests in info_quests.items():
         quest_type = TYPE_CONVERSION.get(quest_type, QuestType(0))
@@ -64,8 +65,9 @@ def _make_quest_list(pogodata):
                 reward_type = match_enum(reward_types, raw_type)
 
                 if reward_type in (reward_types.POKEMON_ENCOUNTER, reward_types.MEGA_RESOURCE):
-                    reward_args = raw_reward["reward"]
-                    reward = pogodata.get_mon(**reward_args).copy()
+                    mon_rewards.append((quest, len(quest.rewards), reward_type, raw_reward["reward"]))
+                    quest.rewards.append(None)
+                    continue
                 elif reward_type == reward_types.ITEM:
                     reward = pogodata.get_item(id=raw_reward["id"]).copy()
                 else:
@@ -79,3 +81,9 @@ def _make_quest_list(pogodata):
                 quest.rewards.append(reward)
 
             pogodata.quests.append(quest)
+
+    mons = pogodata.get_mons([reward_args for _, _, _, reward_args in mon_rewards])
+    for (quest, position, reward_type, _), mon in zip(mon_rewards, mons):
+        reward = mon.copy()
+        reward.reward_type = reward_type
+        quest.rewards[position] = reward
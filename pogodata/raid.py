@@ -1,6 +1,3 @@
-from .misc import httpget, INFO_URL
-
-
 class RaidIterator:
     def __init__(self, raids):
         self.mons = []
@@ -35,15 +32,13 @@ class Raids:
     def __getitem__(self, key):
         return self.raids.get(key, [])
 
+    def __len__(self):
+        return sum(len(mons) for mons in self.raids.values())
 
-def _make_raid_list(pogodata):
+
+def _make_raid_list(pogodata, raw_raids):
     pogodata.raids = Raids()
-    raw_raids = httpget(INFO_URL + "active/raids.json").json()
     for level, mons in raw_raids.items():
-        for raw_mon in mons:
-            if not raw_mon:
-                continue
-            mon = pogodata.get_mon(**raw_mon)
-
+        for mon in pogodata.get_mons([raw_mon for raw_mon in mons if raw_mon]):
             if mon:
                 pogodata.raids.add_mon(level, mon)
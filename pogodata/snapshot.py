@@ -0,0 +1,295 @@
+import io
+import os
+import sys
+import json
+import zlib
+import pickle
+import struct
+import weakref
+import threading
+from enum import Enum
+
+from .index import ObjectIndex
+from .gamemaster import GameMaster
+from .montable import MonTable
+from .event import EventIndex
+
+INDEXED_LISTS = ("types", "items", "weather", "moves", "mons", "grunts")
+
+FORMAT_VERSION = 7
+MAGIC = b"PGDSNAP\n"
+_HEADER = struct.Struct(">HI")
+
+# Sections that are only unpickled once they're accessed
+LAZY_SECTIONS = ("quests", "events", "raw_protos", "raw_gamemaster")
+COMPRESSED_SECTIONS = ("raw_protos", "raw_gamemaster")
+
+# Objects in these lists are stored once and referenced from every other section
+REFERENCED_LISTS = ("types", "items", "weather", "moves", "mons")
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file can't be loaded, e.g. because it was written by an incompatible version"""
+
+
+# What reading a truncated or otherwise broken snapshot file can raise
+_CORRUPT_ERRORS = (
+    struct.error, ValueError, KeyError, IndexError, TypeError, AttributeError, ImportError, EOFError,
+    pickle.UnpicklingError, zlib.error
+)
+
+
+class Snapshot:
+    """Everything one reload produces.
+
+    A snapshot is built completely before it's handed to :class:`.PogoData`, which swaps it in
+    with a single assignment. It isn't modified afterwards, so readers never see partial data.
+    """
+    ATTRIBUTES = (
+        "icon", "raw_protos", "protos", "raw_gamemaster", "locale", "updated",
+        "types", "items", "weather", "moves", "mons", "quests", "raids", "grunts", "events",
+        "evolution_graph", "hashes"
+    )
+
+    def __init__(self):
+        for attribute in self.ATTRIBUTES:
+            setattr(self, attribute, None)
+        self.indexes = {}
+
+    def __getstate__(self):
+        # Only used to save a snapshot. Copies are made with copy(), which keeps sections lazy
+        for name in LAZY_SECTIONS:
+            getattr(self, name)
+        state = self.__dict__.copy()
+        state["indexes"] = {}
+        state.pop("_loader", None)
+        state.pop("_gamemaster", None)
+        return state
+
+    def __getattr__(self, name):
+        # Only reached for sections of a snapshot file that haven't been loaded yet
+        loader = self.__dict__.get("_loader")
+        if loader is None or name not in LAZY_SECTIONS:
+            raise AttributeError(name)
+        return loader.load(self, name)
+
+    def copy(self):
+        """Returns a shallow copy with its own indexes. Sections that aren't loaded yet stay lazy,
+        and are loaded into this snapshot when the copy accesses them."""
+        snapshot = object.__new__(Snapshot)
+        snapshot.__dict__.update(self.__dict__)
+        snapshot.indexes = {}
+        return snapshot
+
+    def index(self, name):
+        obj_list = getattr(self, name)
+        index = self.indexes.get(name)
+        if index is None or index.objs is not obj_list:
+            index = ObjectIndex(obj_list)
+            self.indexes[name] = index
+        return index
+
+    def mon_table(self):
+        """:class:`.MonTable` over `mons`, rebuilt whenever the list changed"""
+        table = self.indexes.get("mon_table")
+        if table is None or table.mons is not self.mons or len(table.rows) != len(self.mons):
+            table = self.indexes["mon_table"] = MonTable(self.mons)
+        return table
+
+    def event_index(self):
+        """:class:`.EventIndex` over `events`, rebuilt whenever the list changed"""
+        index = self.indexes.get("event_index")
+        if index is None or index.events is not self.events or len(index.events) != index.length:
+            index = self.indexes["event_index"] = EventIndex(self.events)
+        return index
+
+    @property
+    def gamemaster(self):
+        """:class:`.GameMaster` over `raw_gamemaster`, built on first use"""
+        gamemaster = self.__dict__.get("_gamemaster")
+        if gamemaster is None or gamemaster.entries is not self.raw_gamemaster:
+            gamemaster = self._gamemaster = GameMaster(self.raw_gamemaster)
+        return gamemaster
+
+    def build_indexes(self):
+        for name in INDEXED_LISTS:
+            if getattr(self, name) is not None:
+                self.index(name).build()
+
+
+def _is_dynamic_enum(cls):
+    # Enums made from the protos at runtime can't be found by pickle
+    module = sys.modules.get(cls.__module__)
+    return getattr(module, cls.__qualname__, None) is not cls
+
+
+class _Pickler(pickle.Pickler):
+    def __init__(self, file, enums, refs):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.enums = enums
+        self.refs = refs
+
+    def persistent_id(self, obj):
+        ref = self.refs.get(id(obj))
+        if ref is not None:
+            return ref
+        if isinstance(obj, Enum) and _is_dynamic_enum(type(obj)):
+            return "enum", self.enums.key(type(obj)), obj.name
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file, enums, snapshot):
+        super().__init__(file)
+        self.enums = enums
+        self.snapshot = snapshot
+
+    def persistent_load(self, pid):
+        if pid[0] == "enum":
+            return self.enums[pid[1]][pid[2]]
+        elif pid[0] == "icon":
+            return self.snapshot.icon
+        elif pid[0] == "ref":
+            return getattr(self.snapshot, pid[1])[pid[2]]
+        raise pickle.UnpicklingError(f"Unknown reference {pid}")
+
+
+class _EnumRegistry:
+    def __init__(self):
+        self.keys = {}
+        self.definitions = []
+
+    def key(self, cls):
+        key = self.keys.get(id(cls))
+        if key is None:
+            key = self.keys[id(cls)] = len(self.definitions)
+            self.definitions.append([cls.__name__, {k: m.value for k, m in cls.__members__.items()}])
+        return key
+
+
+class _Loader:
+    """Holds the data of the sections that aren't loaded yet, each in its own bytes object, so
+    every section's data can be freed once it's loaded.
+
+    Sections are always loaded into the snapshot read from the file, also when a copy of it
+    asks for them, so each one is only unpickled once.
+    """
+    def __init__(self, filename, sections, enums):
+        self.filename = filename
+        self.sections = sections
+        self.enums = enums
+        self.lock = threading.Lock()
+        self.owner = None
+
+    def unpickle(self, snapshot, name):
+        try:
+            data, compressed = self.sections.pop(name)
+            if compressed:
+                data = zlib.decompress(data)
+            return _Unpickler(io.BytesIO(data), self.enums, snapshot).load()
+        except _CORRUPT_ERRORS as e:
+            raise SnapshotError(f"{self.filename} is corrupt, its {name} section can't be loaded") from e
+
+    def load(self, snapshot, name):
+        with self.lock:
+            owner = self.owner() if self.owner is not None else None
+            if owner is None:
+                owner = snapshot
+            if name not in owner.__dict__:
+                setattr(owner, name, self.unpickle(owner, name))
+                if not self.sections:
+                    owner.__dict__.pop("_loader", None)
+            return owner.__dict__[name]
+
+
+def save_snapshot(snapshot, filename, config=None):
+    """Writes a snapshot to a file.
+
+    Every section is pickled on its own. Objects from the main lists are only stored once and
+    referenced from all other sections, and rarely used sections are loaded lazily.
+    """
+    enums = _EnumRegistry()
+    refs = {}
+    sections = []
+
+    core = {name: getattr(snapshot, name) for name in Snapshot.ATTRIBUTES if name not in LAZY_SECTIONS}
+    for name in ("core",) + LAZY_SECTIONS:
+        value = core if name == "core" else getattr(snapshot, name)
+        buffer = io.BytesIO()
+        _Pickler(buffer, enums, refs).dump(value)
+        data = buffer.getvalue()
+        compressed = name in COMPRESSED_SECTIONS
+        if compressed:
+            data = zlib.compress(data)
+        sections.append((name, data, compressed))
+
+        if name == "core":
+            refs[id(snapshot.icon)] = ("icon",)
+            for list_name in REFERENCED_LISTS:
+                for i, obj in enumerate(getattr(snapshot, list_name) or ()):
+                    refs[id(obj)] = ("ref", list_name, i)
+
+    header = {
+        "config": config or {},
+        "enums": enums.definitions,
+        "sections": {}
+    }
+    offset = 0
+    for name, data, compressed in sections:
+        header["sections"][name] = [offset, len(data), compressed]
+        offset += len(data)
+    header = json.dumps(header).encode("utf-8")
+
+    temp = filename + ".tmp"
+    with open(temp, "wb") as handle:
+        handle.write(MAGIC)
+        handle.write(_HEADER.pack(FORMAT_VERSION, len(header)))
+        handle.write(header)
+        for _, data, _ in sections:
+            handle.write(data)
+    # Replace the old file at once, in case other workers are loading it
+    os.replace(temp, filename)
+
+
+def load_snapshot(filename):
+    """Loads a snapshot file.
+
+    Returns
+    -------
+    A tuple of the :class:`Snapshot` and the config dict it was saved with.
+    """
+    with open(filename, "rb") as handle:
+        data = handle.read()
+
+    if not data.startswith(MAGIC):
+        raise SnapshotError(f"{filename} is not a PogoData snapshot")
+    try:
+        version, header_length = _HEADER.unpack_from(data, len(MAGIC))
+        if version != FORMAT_VERSION:
+            raise SnapshotError(
+                f"{filename} has snapshot format version {version}, but this version of PogoData reads {FORMAT_VERSION}"
+            )
+        start = len(MAGIC) + _HEADER.size
+        header = json.loads(data[start:start + header_length])
+        start += header_length
+
+        enums = [Enum(name, members) for name, members in header["enums"]]
+        # Copied out of the file, so the file's data isn't kept alive by any of them
+        sections = {}
+        for name, (offset, length, compressed) in header["sections"].items():
+            if start + offset + length > len(data):
+                raise SnapshotError(f"{filename} is truncated")
+            sections[name] = (data[start + offset:start + offset + length], compressed)
+        config = header["config"]
+    except _CORRUPT_ERRORS as e:
+        raise SnapshotError(f"{filename} is corrupt, its header can't be read") from e
+    del data
+    loader = _Loader(filename, sections, enums)
+
+    snapshot = Snapshot.__new__(Snapshot)
+    snapshot.indexes = {}
+    snapshot._loader = loader
+    loader.owner = weakref.ref(snapshot)
+    for name, value in loader.unpickle(snapshot, "core").items():
+        setattr(snapshot, name, value)
+    return snapshot, config
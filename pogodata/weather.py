@@ -2,9 +2,11 @@ from .objects import GameMasterObject
 
 
 class Weather(GameMasterObject):
+    __slots__ = ("type_boosts", "__icon")
+
     def __init__(self, icon, template, entry, wid):
         super().__init__(wid, template, entry)
-        self.type_boosts = []
+        self.type_boosts = ()
         self.__icon = icon
 
     @property
@@ -18,8 +20,7 @@ def _make_weather_list(pogodata):
     for _, entry in pogodata.get_gamemaster(r"^WEATHER_AFFINITY_.*", "weatherAffinities"):
         template = entry["weatherCondition"]
         weather = Weather(pogodata.icon, template, entry, wather_enum.get(template))
-        weather.name = pogodata.get_locale("weather_" + template)
-        for boost_type in entry["pokemonType"]:
-            type_ = pogodata.get_type(template=boost_type)
-            weather.type_boosts.append(type_)
+        weather.locale_key = "weather_" + template
+        weather.name = pogodata.get_locale(weather.locale_key)
+        weather.type_boosts = tuple(pogodata.get_type(template=t) for t in entry["pokemonType"])
         pogodata.weather.append(weather)
@@ -8,6 +8,7 @@ setup(
     url="https://github.com/ccev/pogodata",
     version=version,
     install_requires=["requests"],
+    extras_require={"cp": ["numpy"]},
     packages=["pogodata"],
     long_description="For documentation, plase visit https://github.com/ccev/pogodata",
     description="Easy and up-to-date Pogo Data"
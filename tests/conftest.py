@@ -0,0 +1,60 @@
+import os
+import json
+import shutil
+
+import pytest
+
+from pogodata import PogoData
+from pogodata.fetch import LocalTransport
+from pogodata.misc import (
+    PROTO_URL, GAMEMASTER_URL, LOCALE_URL, REMOTE_LOCALE_URL, INFO_URL, INGAME_ICONS, ICON_SHA
+)
+
+DATA = os.path.join(os.path.dirname(__file__), "data")
+
+# The file in tests/data every upstream URL is served from
+FILES = {
+    PROTO_URL: "base.proto",
+    GAMEMASTER_URL: "latest.json",
+    LOCALE_URL.format(lang="English"): "apk_English.txt",
+    REMOTE_LOCALE_URL.format(lang="English"): "remote_English.txt",
+    INFO_URL + "active/raids.json": "raids.json",
+    INFO_URL + "active/quests.json": "quests.json",
+    INFO_URL + "active/grunts.json": "grunts.json",
+    INFO_URL + "active/events.json": "events.json",
+    ICON_SHA: "branch.json",
+    INGAME_ICONS.format(sha="abc123"): "ingame_tree.json"
+}
+
+
+class Upstream:
+    """A copy of the fixture data that tests can change between reloads"""
+    def __init__(self, path):
+        self.path = path
+        shutil.copytree(DATA, path)
+        self.transport = LocalTransport(files={url: os.path.join(path, name) for url, name in FILES.items()})
+
+    def load(self, name):
+        with open(os.path.join(self.path, name)) as handle:
+            return json.load(handle)
+
+    def dump(self, name, data):
+        with open(os.path.join(self.path, name), "w") as handle:
+            json.dump(data, handle)
+
+    def gamemaster_entry(self, gamemaster, template_id):
+        return next(entry for entry in gamemaster if entry["templateId"] == template_id)
+
+    def data(self, **kwargs):
+        return PogoData(transport=self.transport, **kwargs)
+
+
+@pytest.fixture
+def upstream(tmp_path):
+    return Upstream(str(tmp_path / "upstream"))
+
+
+@pytest.fixture(scope="session")
+def data(tmp_path_factory):
+    """Data of the unchanged fixture, loaded once for all tests that don't reload"""
+    return Upstream(str(tmp_path_factory.mktemp("data") / "upstream")).data()
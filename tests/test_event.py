@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from pogodata.event import Event, EventIndex, EventBonusType
+
+
+def event(name, start, end, bonuses=()):
+    return Event({
+        "name": name,
+        "type": "event",
+        "start": start,
+        "end": end,
+        "bonuses": [{"template": bonus} for bonus in bonuses]
+    })
+
+
+EVENTS = [
+    event("week", "2021-01-01 10:00", "2021-01-08 20:00", ["increased-stardust"]),
+    event("day", "2021-01-05 11:00", "2021-01-05 17:00", ["increased-xp"]),
+    # Starts when "day" ends
+    event("evening", "2021-01-05 17:00", "2021-01-05 20:00"),
+    event("open end", "2021-01-07 00:00", None, ["increased-xp"]),
+    event("open start", None, "2021-01-02 00:00"),
+    event("same start", "2021-01-01 10:00", "2021-01-03 10:00")
+]
+
+
+def is_active(event, time):
+    return (event.start is None or event.start <= time) and (event.end is None or time < event.end)
+
+
+def overlaps(event, start, end):
+    return (event.start is None or event.start < end) and (event.end is None or start < event.end)
+
+
+def times():
+    # Every boundary and the moments right around it
+    boundaries = sorted({time for e in EVENTS for time in (e.start, e.end) if time is not None})
+    minute = timedelta(minutes=1)
+    return sorted(
+        {time + offset for time in boundaries for offset in (-minute, timedelta(0), minute)}
+        | {datetime(2000, 1, 1), datetime(2100, 1, 1)}
+    )
+
+
+@pytest.fixture
+def index():
+    return EventIndex(EVENTS)
+
+
+def test_active(index):
+    for time in times():
+        assert index.active(time) == [e for e in EVENTS if is_active(e, time)], time
+
+
+def test_active_bonus(index):
+    for time in times():
+        expected = [e for e in EVENTS if is_active(e, time) and any(
+            b.type == EventBonusType.XP for b in e.bonuses
+        )]
+        assert index.active(time, EventBonusType.XP) == expected, time
+
+
+def test_between(index):
+    all_times = times()
+    for start in all_times:
+        for end in all_times:
+            if start < end:
+                expected = [e for e in EVENTS if overlaps(e, start, end)]
+                assert index.between(start, end) == expected, (start, end)
+
+
+def test_next_change(index):
+    boundaries = sorted({time for e in EVENTS for time in (e.start, e.end) if time is not None})
+    for time in times():
+        later = [boundary for boundary in boundaries if boundary > time]
+        assert index.next_change(time) == (later[0] if later else None), time
+
+
+def test_empty():
+    index = EventIndex([])
+    assert index.active(datetime(2021, 1, 1)) == []
+    assert index.between(datetime(2021, 1, 1), datetime(2021, 1, 2)) == []
+    assert index.next_change(datetime(2021, 1, 1)) is None
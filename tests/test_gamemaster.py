@@ -0,0 +1,29 @@
+import re
+
+import pytest
+
+from pogodata.gamemaster import GameMaster
+
+TEMPLATES = [
+    "V0001_POKEMON_BULBASAUR", "V0001_POKEMON_BULBASAUR_NORMAL", "V0003_POKEMON_VENUSAUR",
+    "FORMS_V0001_POKEMON_BULBASAUR", "TEMPORARY_EVOLUTION_V0003_POKEMON_VENUSAUR",
+    "COMBAT_V0214_MOVE_VINE_WHIP_FAST", "COMBAT_V0116_MOVE_SOLAR_BEAM", "COMBAT_V0221_MOVE_TACKLE_FAST",
+    "ITEM_POKE_BALL", "ITEM_RAZZ_BERRY", "WEATHER_AFFINITY_CLEAR", "WEATHER_AFFINITY_RAINY",
+    "CHARACTER_GRASS_GRUNT_MALE", "COMBAT_LEAGUE_DEFAULT_GREAT"
+]
+
+PATTERNS = [
+    r"^V\d{4}_POKEMON_.*", r"^ITEM_.*", r"^COMBAT_V\d{4}_MOVE_", r"^FORMS_V\d{4}_POKEMON_.*",
+    r"^ITEM_|^COMBAT_", r"^ITEM_.*|WEATHER", r"^V\d{4}_POKEMON_|ITEM_", r"^ITEM_(?:POKE|RAZZ)_",
+    r"^ITEM_POKE|^ITEM_RAZZ", r"POKEMON", r"_FAST$"
+]
+
+
+def full_scan(pattern):
+    return [t for t in TEMPLATES if re.search(pattern, t)]
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_search_matches_full_scan(pattern):
+    gamemaster = GameMaster([{"templateId": t} for t in TEMPLATES])
+    assert [e["templateId"] for e in gamemaster.search(pattern)] == full_scan(pattern)
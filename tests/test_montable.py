@@ -0,0 +1,56 @@
+import pytest
+
+from pogodata.montable import MonTable, key_args
+
+np = pytest.importorskip("numpy")
+
+
+def value(value):
+    return getattr(value, "value", value)
+
+
+def keys(data):
+    # Full keys of every Pokémon, all partial keys of them and some without a match
+    found = set()
+    for mon in data.mons:
+        full = (mon.id, mon.form, value(mon.costume), value(mon.temp_evolution))
+        for length in range(1, 5):
+            found.add(full[:length])
+        found.add((mon.id, None, value(mon.costume)))
+        found.add((mon.id, None, None, value(mon.temp_evolution)))
+    return sorted(found, key=repr) + [(9999,), (1, 9999), (3, None, None, 5)]
+
+
+def expected_position(data, key):
+    mon = data.get_mon(**key_args(key))
+    if not mon:
+        return -1
+    return next(position for position, obj in enumerate(data.mons) if obj is mon)
+
+
+def test_position(data):
+    table = MonTable(data.mons)
+    for key in keys(data):
+        assert table.position(key) == expected_position(data, key), key
+        assert table.position(key_args(key)) == expected_position(data, key), key
+
+
+def test_positions(data):
+    table = MonTable(data.mons)
+    all_keys = keys(data)
+    expected = [expected_position(data, key) for key in all_keys]
+    assert table.positions(all_keys) == expected
+    assert data.get_mons(all_keys, indices=True) == expected
+
+    # The same keys as an array, with -1 for values left out
+    full = [key for key in all_keys if len(key) == 4]
+    array = np.array([[-1 if part is None else part for part in key] for key in full])
+    assert table.positions(array).tolist() == [expected_position(data, key) for key in full]
+
+
+def test_unresolvable_keys(data):
+    table = MonTable(data.mons)
+    assert table.position({"name": "Bulbasaur"}) is None
+    assert data.get_mons([{"template": "IVYSAUR"}])[0] is data.get_mon(template="IVYSAUR")
+    with pytest.raises(ValueError):
+        table.position((1, 0, 0, 0, 0))
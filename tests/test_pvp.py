@@ -0,0 +1,63 @@
+from math import floor
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from pogodata.misc import CP_MULTIPLIERS
+from pogodata.pvp import PvpRanks, rank_table
+from pogodata.cp import LEVELS, IVS
+
+# Weak, average and strong base stats
+STATS = [(118, 111, 128), (198, 189, 190), (300, 182, 214)]
+
+
+def brute_force(stats, cap, max_level=50):
+    """(rank, level, cp, stat product) of every IV combination, or None for ones over the cap at level 1"""
+    levels = sorted(level for level in CP_MULTIPLIERS if level <= max_level)
+    best = []
+    for ivs in IVS.tolist():
+        attack, defense, stamina = (base + iv for base, iv in zip(stats, ivs))
+        found = None
+        for level in levels:
+            multiplier = CP_MULTIPLIERS[level]
+            cp = max(floor(attack * defense**0.5 * stamina**0.5 * multiplier**2 / 10), 10)
+            if cp > cap:
+                break
+            hp = max(floor(stamina * multiplier), 10)
+            found = level, cp, attack * multiplier * defense * multiplier * hp
+        best.append(found)
+
+    products = [found[2] for found in best if found is not None]
+    return [
+        None if found is None else (1 + sum(product > found[2] for product in products),) + found
+        for found in best
+    ]
+
+
+@pytest.mark.parametrize("stats", STATS)
+@pytest.mark.parametrize("cap", [500, 1500, 50])
+def test_rank_table(stats, cap):
+    rank, level, cp, stat_product = rank_table(stats, cap)
+    for i, expected in enumerate(brute_force(stats, cap)):
+        if expected is None:
+            assert rank[i] == 0 and stat_product[i] == 0
+        else:
+            assert (int(rank[i]), float(LEVELS[level[i]]), int(cp[i])) == expected[:3]
+            assert stat_product[i] == pytest.approx(expected[3])
+
+
+def test_get(data):
+    ranks = PvpRanks(data.mons, processes=0)
+    mon = data.get_mon(id=1)
+    assert ranks.get(mon, (0, 15, 15), "great") == ranks.get(mon.stats, (0, 15, 15), 1500)
+
+    rank, level, cp, stat_product = rank_table(mon.stats, 500)
+    iv = 0 * 256 + 15 * 16 + 15
+    assert tuple(ranks.get(mon, (0, 15, 15), "little")) == (
+        rank[iv], LEVELS[level[iv]], cp[iv], pytest.approx(stat_product[iv])
+    )
+    assert ranks.get((1, 2, 3), (0, 0, 0), "great") is None
+    for ivs in ((16, 0, 0), (-1, 0, 0), (1.5, 0, 0), (1, 2)):
+        with pytest.raises(ValueError):
+            ranks.get(mon, ivs, "great")
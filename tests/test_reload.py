@@ -0,0 +1,49 @@
+from pogodata import Changes
+
+
+def test_unchanged_reload(upstream):
+    data = upstream.data()
+    lists = {name: getattr(data, name) for name in ("types", "items", "moves", "mons", "raids", "events")}
+
+    assert data.reload() == {}
+    # Nothing is rebuilt, every subsystem is taken over
+    for name, objs in lists.items():
+        assert getattr(data, name) is objs
+
+
+def test_changed_gamemaster(upstream):
+    data = upstream.data()
+    received = []
+    data.subscribe(received.append)
+    items = data.items
+    old_move = data.get_move(template="VINE_WHIP_FAST")
+
+    gamemaster = upstream.load("latest.json")
+    upstream.gamemaster_entry(gamemaster, "COMBAT_V0214_MOVE_VINE_WHIP_FAST")["data"]["combatMove"]["power"] = 99
+    upstream.dump("latest.json", gamemaster)
+    changes = data.reload()
+
+    assert list(changes) == ["moves"]
+    assert changes["moves"].added == [] and changes["moves"].removed == []
+    [(old, new)] = changes["moves"].changed
+    assert old is old_move and new.power == 99
+    assert data.get_move(template="VINE_WHIP_FAST") is new
+    # Mons use the moves, so they're rebuilt. Items aren't
+    assert data.items is items
+    assert data.get_mon(id=1).quick_moves[0] is new
+    assert received == [changes]
+
+
+def test_only_reload(upstream):
+    data = upstream.data()
+    mons = data.mons
+
+    raids = upstream.load("raids.json")
+    raids["1"].append({"id": 2})
+    upstream.dump("raids.json", raids)
+    changes = data.reload(only=["raids"])
+
+    assert list(changes) == ["raids"]
+    assert isinstance(changes["raids"], Changes)
+    assert [(raid.level, raid.template) for raid in changes["raids"].added] == [(1, "IVYSAUR")]
+    assert data.mons is mons
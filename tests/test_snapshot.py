@@ -0,0 +1,90 @@
+import pytest
+
+from pogodata import load_pogodata, SnapshotError
+from pogodata.snapshot import LAZY_SECTIONS, load_snapshot
+
+
+def value(value):
+    # Enums made from the protos are made again on every load, so only their values compare equal
+    return getattr(value, "value", value)
+
+
+def mon_keys(data):
+    return [
+        (mon.id, mon.template, mon.form, value(mon.costume), value(mon.temp_evolution), mon.asset, mon.name)
+        for mon in data.mons
+    ]
+
+
+def loaded_sections(data):
+    return sorted(name for name in LAZY_SECTIONS if name in data._snapshot.__dict__)
+
+
+@pytest.fixture
+def saved(upstream, tmp_path):
+    def save(**kwargs):
+        path = str(tmp_path) + "/"
+        upstream.data(**kwargs).save(path)
+        return path
+    return save
+
+
+def test_round_trip(upstream, saved):
+    data = upstream.data()
+    loaded = load_pogodata(saved(), transport=upstream.transport)
+
+    assert mon_keys(loaded) == mon_keys(data)
+    assert [move.template for move in loaded.moves] == [move.template for move in data.moves]
+    assert [(raid.level, raid.template) for raid in loaded.raids] == [(raid.level, raid.template) for raid in data.raids]
+    assert [event.name for event in loaded.events] == [event.name for event in data.events]
+    assert len(loaded.get_gamemaster("^ITEM_")) == len(data.get_gamemaster("^ITEM_"))
+    assert loaded.get_mon(id=1) is loaded.mons[0]
+
+
+def test_sections_are_lazy(upstream, saved):
+    loaded = load_pogodata(saved(), transport=upstream.transport)
+    assert loaded_sections(loaded) == []
+
+    loaded.quests
+    assert loaded_sections(loaded) == ["quests"]
+
+    for name in LAZY_SECTIONS:
+        getattr(loaded._snapshot, name)
+    assert "_loader" not in loaded._snapshot.__dict__
+
+
+def test_build_on_access_keeps_sections_lazy(upstream, saved):
+    loaded = load_pogodata(saved(subsystems=["mons"]), transport=upstream.transport)
+    assert loaded._snapshot.__dict__["raids"] is None
+
+    assert len(loaded.raids) == 2
+    assert loaded_sections(loaded) == []
+
+    # Quests need items, which are built from the gamemaster. Sections a build asks for are loaded
+    # into the live snapshot, so they're only unpickled once
+    assert len(loaded.quests) == 2
+    assert loaded_sections(loaded) == ["quests", "raw_gamemaster"]
+    assert loaded.get_item(id=1)
+
+
+def test_load_errors(saved, tmp_path):
+    path = saved()
+    filename = path + "__pogodata_save__.snapshot"
+    with open(filename, "rb") as handle:
+        data = handle.read()
+
+    for name, broken in (("truncated", data[:len(data) // 2]), ("header", data[:20] + b"\0" * 20 + data[40:])):
+        broken_file = str(tmp_path / name)
+        with open(broken_file, "wb") as handle:
+            handle.write(broken)
+        with pytest.raises(SnapshotError):
+            load_snapshot(broken_file)
+
+
+def test_lazy_load_error(saved, tmp_path):
+    path = saved()
+    snapshot, _ = load_snapshot(path + "__pogodata_save__.snapshot")
+    data, compressed = snapshot._loader.sections["quests"]
+    snapshot._loader.sections["quests"] = (b"\x80\x05broken" + data[8:], compressed)
+    with pytest.raises(SnapshotError):
+        snapshot.quests